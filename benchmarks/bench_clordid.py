@@ -0,0 +1,24 @@
+"""
+Microbenchmark: ClOrdID generation, uuid4()[:8] vs ClOrdIdGenerator.
+
+    python benchmarks/bench_clordid.py [iterations]
+"""
+
+import sys
+import timeit
+
+from paperbroker.session.ids import ClOrdIdGenerator, uuid8
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def report(name, seconds):
+    print(f"{name:<28} {N / seconds:>14,.0f} ids/s  {seconds / N * 1e9:>6.0f} ns/id")
+
+
+if __name__ == "__main__":
+    generator = ClOrdIdGenerator()
+    report("uuid4()[:8]", timeit.timeit(uuid8, number=N))
+    report("ClOrdIdGenerator", timeit.timeit(generator, number=N))
+    sample = [generator() for _ in range(3)]
+    print(f"sample IDs: {sample}")
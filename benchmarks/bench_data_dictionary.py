@@ -0,0 +1,80 @@
+"""
+Microbenchmark: full fix/FIX44.xml vs the trimmed fix/FIX44-min.xml.
+
+    python benchmarks/bench_data_dictionary.py [iterations]
+
+Parsing the XML runs anywhere; loading a fix.DataDictionary (what every
+session start does) and validating an ExecutionReport need quickfix.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import xml.etree.ElementTree as ET
+
+from paperbroker.session.data_dictionary import trim_dictionary
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+FULL = os.path.join(os.path.dirname(__file__), "..", "fix", "FIX44.xml")
+
+
+def report(name, seconds, n=N):
+    print(f"{name:<40} {seconds / n * 1e3:>10.2f} ms/op")
+
+
+def bench_validation(full, trimmed):
+    try:
+        import quickfix as fix
+        import quickfix44 as fix44
+    except ImportError:
+        print("quickfix not installed; skipping DataDictionary load/validate")
+        return
+
+    for name, path in (("full", full), ("trimmed", trimmed)):
+        report(
+            f"DataDictionary load: {name}",
+            timeit.timeit(lambda: fix.DataDictionary(path), number=N),
+        )
+
+    message = fix44.ExecutionReport()
+    message.getHeader().setField(fix.SenderCompID("SERVER"))
+    message.getHeader().setField(fix.TargetCompID("CLIENT_1"))
+    message.getHeader().setField(fix.MsgSeqNum(1))
+    message.getHeader().setField(fix.SendingTime())
+    for field in (
+        fix.OrderID("d4fb34fe"),
+        fix.ExecID("1f5300bb"),
+        fix.ExecType(fix.ExecType_TRADE),
+        fix.OrdStatus(fix.OrdStatus_PARTIALLY_FILLED),
+        fix.Symbol("VN30F2508"),
+        fix.Side(fix.Side_BUY),
+        fix.LeavesQty(1),
+        fix.CumQty(1),
+        fix.AvgPx(1610),
+        fix.ClOrdID("d306a7bd"),
+    ):
+        message.setField(field)
+    n = N * 1000
+    for name, path in (("full", full), ("trimmed", trimmed)):
+        dictionary = fix.DataDictionary(path)
+        report(
+            f"validate ExecutionReport: {name}",
+            timeit.timeit(lambda: dictionary.validate(message), number=n),
+            n,
+        )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        trimmed = os.path.join(tmp, "FIX44-min.xml")
+        messages, fields = trim_dictionary(FULL, trimmed)
+        print(f"trimmed: {messages} messages, {fields} fields")
+        print(
+            f"size: {os.path.getsize(FULL):,} -> {os.path.getsize(trimmed):,} bytes"
+        )
+        report("XML parse: full", timeit.timeit(lambda: ET.parse(FULL), number=N))
+        report(
+            "XML parse: trimmed", timeit.timeit(lambda: ET.parse(trimmed), number=N)
+        )
+        bench_validation(FULL, trimmed)
@@ -0,0 +1,95 @@
+"""
+Microbenchmark: ExecutionReport decoding, old path vs exec_decoder.
+
+    python benchmarks/bench_exec_decoder.py [iterations]
+
+The timestamp comparison runs anywhere; the full-report comparison needs
+quickfix installed, since the old path reads fields from a fix.Message.
+"""
+
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from paperbroker.session.exec_decoder import SOH, decode_execution_report
+from paperbroker.session.fix_time import parse_utc_timestamp_ns
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+TRANSACT_TIME = "20250731-15:59:46.012"
+FIELDS = [
+    (35, "8"),
+    (11, "d306a7bd"),
+    (37, "d4fb34fe-9fe0-4ba3-baee-f15c628addbd"),
+    (17, "1f5300bb-9fca-40f2-bb94-796c4b778c48"),
+    (150, "F"),
+    (39, "2"),
+    (55, "VN30F2508"),
+    (54, "1"),
+    (31, "1610"),
+    (32, "1"),
+    (60, TRANSACT_TIME),
+]
+RAW = SOH.join(f"{tag}={value}" for tag, value in FIELDS) + SOH
+
+
+def report(name, seconds, n=N):
+    print(f"{name:<40} {n / seconds:>14,.0f} /s  {seconds / n * 1e9:>8.0f} ns/op")
+
+
+def strptime_ns():
+    dt = datetime.strptime(TRANSACT_TIME, "%Y%m%d-%H:%M:%S.%f").replace(
+        tzinfo=timezone.utc
+    )
+    return int(dt.timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+
+
+def bench_timestamps():
+    assert strptime_ns() == parse_utc_timestamp_ns(TRANSACT_TIME)
+    report("timestamp: datetime.strptime", timeit.timeit(strptime_ns, number=N))
+    report(
+        "timestamp: parse_utc_timestamp_ns",
+        timeit.timeit(lambda: parse_utc_timestamp_ns(TRANSACT_TIME), number=N),
+    )
+
+
+def bench_reports():
+    try:
+        import quickfix as fix
+        import quickfix44 as fix44
+    except ImportError:
+        print("quickfix not installed; skipping full-report comparison")
+        return
+
+    message = fix44.ExecutionReport()
+    for tag, value in FIELDS[1:]:
+        message.setField(tag, value)
+
+    def old_path():
+        # What on_execution_report did before the decoder
+        message.getHeader().getField(fix.MsgType().getTag())
+        message.getField(fix.ClOrdID().getTag())
+        message.getField(fix.OrdStatus().getTag())
+        message.getField(fix.ExecType().getTag())
+        message.getField(fix.OrderID().getTag())
+        ts = message.getField(fix.TransactTime().getTag())
+        datetime.strptime(ts, "%Y%m%d-%H:%M:%S.%f").replace(tzinfo=timezone.utc)
+        float(message.getField(fix.LastPx().getTag()))
+        float(message.getField(fix.LastQty().getTag()))
+        if message.isSetField(fix.Text().getTag()):
+            message.getField(fix.Text().getTag())
+
+    def new_path():
+        decode_execution_report(message.toString())
+
+    report("report: getField + strptime", timeit.timeit(old_path, number=N))
+    report("report: decode_execution_report", timeit.timeit(new_path, number=N))
+
+
+if __name__ == "__main__":
+    bench_timestamps()
+    report(
+        "report: decode raw string only",
+        timeit.timeit(lambda: decode_execution_report(RAW), number=N),
+    )
+    bench_reports()
@@ -0,0 +1,62 @@
+"""
+Microbenchmark: the toApp callback, old stamping vs OutboundStamper.
+
+    python benchmarks/bench_to_app.py [iterations]
+
+Needs quickfix. Runs once at DEBUG, the level get_logger() sets up by
+default, where both paths build a log record for every message, and once
+at INFO, where the new path skips logging entirely but the old one still
+paid for the f-string. Handlers are NullHandlers, so file I/O is not
+included.
+"""
+
+import logging
+import sys
+import timeit
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+def report(name, seconds, n=N):
+    print(f"{name:<48} {n / seconds:>14,.0f} msg/s  {seconds / n * 1e9:>8.0f} ns/msg")
+
+
+if __name__ == "__main__":
+    try:
+        import quickfix as fix
+    except ImportError:
+        print("quickfix not installed; nothing to measure")
+        sys.exit(0)
+
+    from paperbroker.session.handler_app import AppHandler
+    from paperbroker.session.order_template import OrderTemplate
+    from paperbroker.session.stamping import OutboundStamper
+
+    logger = logging.getLogger("bench_to_app")
+    logger.addHandler(logging.NullHandler())
+    session_id = fix.SessionID("FIX.4.4", "CLIENT_1", "SERVER")
+    stamper = OutboundStamper("ACC_1", "user")
+    handler = AppHandler("ACC_1", "user", "secret", logger, stamper=stamper)
+
+    plain = OrderTemplate("HNXDS:VN30F2508", "BUY").build("d306a7bd", 1, 1650)
+    stamped = OrderTemplate(
+        "HNXDS:VN30F2508", "BUY", stamp_fields=stamper.fields
+    ).build("d306a7bd", 1, 1650)
+
+    def old_to_app():
+        # What AppHandler.to_app did before OutboundStamper
+        plain.setField(fix.Username("user"))
+        plain.setField(fix.Account("ACC_1"))
+        logger.debug(f"[TO APP] {plain}")
+
+    for level in (logging.DEBUG, logging.INFO):
+        logger.setLevel(level)
+        name = logging.getLevelName(level)
+        report(
+            f"toApp [{name}]: new fields + eager f-string",
+            timeit.timeit(old_to_app, number=N),
+        )
+        report(
+            f"toApp [{name}]: stamper, template pre-stamped",
+            timeit.timeit(lambda: handler.to_app(stamped, session_id), number=N),
+        )
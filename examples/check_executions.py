@@ -30,15 +30,10 @@ seller = PaperBrokerClient(
 )
 
 try:
-    # Connect both
+    # Connect both; connect() returns once each FIX session is logged on
     buyer.connect()
     seller.connect()
 
-    # Wait until both FIX sessions are fully established
-    while buyer.get_session_id() is None or seller.get_session_id() is None:
-        print("[WAITING] Waiting for both FIX logons...")
-        time.sleep(0.2)
-
     # Step 1: Buyer places a BUY order
     cl_buy = buyer.place_order("HNXDS:VN30F2508", "BUY", qty=1, price=1610)
     print(f"[STEP 1] Buyer placed order: {cl_buy}")
@@ -12,7 +12,8 @@ client = PaperBrokerClient(
     cfg_path=os.getenv("cfg_path", "default.cfg"),
     console=True,
 )
-client.connect()
+client.connect()  # blocks until FIX logon, raises TimeoutError otherwise
+print(client.session_stats())
 
 time.sleep(5)
 
@@ -56,31 +56,24 @@ def get_latest_matched_price(timeout=1):
     return None
 
 
+def requote(cl_ord_id, side, price):
+    # Amend a resting quote in place; place a fresh one if it is gone
+    if cl_ord_id and client.get_order_status(cl_ord_id) in ("New", "PartiallyFilled"):
+        return client.replace_order(cl_ord_id, price=price)
+    return client.place_order(INSTRUMENT, side, 1, price)
+
+
 def place_order():
     global bid_cl_ord_id, ask_cl_ord_id, latest_place_time
 
-    # Cancel old orders
-    for cl_id in (bid_cl_ord_id, ask_cl_ord_id):
-        if cl_id:
-            client.cancel_order(cl_id)
-
-    # Place new orders
-    bid_cl_ord_id = client.place_order(INSTRUMENT, "BUY", 1, bid)
-    ask_cl_ord_id = client.place_order(INSTRUMENT, "SELL", 1, ask)
+    bid_cl_ord_id = requote(bid_cl_ord_id, "BUY", bid)
+    ask_cl_ord_id = requote(ask_cl_ord_id, "SELL", ask)
     latest_place_time = time.time()
 
 
-def update_inventory(portfolio):
+def update_inventory(new_quantity):
     global inventory, bid, ask
 
-    new_quantity = next(
-        (
-            h.get("quantity", 0)
-            for h in portfolio.get("holdings", [])
-            if h.get("instrument") == INSTRUMENT
-        ),
-        0,
-    )
     if new_quantity < inventory:
         ask = None
     elif new_quantity > inventory:
@@ -108,7 +101,8 @@ try:
             bid = round((price - step) - step * max(inventory, 0) * 0.02, 1)
             ask = round((price + step) + step * min(inventory, 0) * 0.02, 1)
 
-        update_inventory(client.get_portfolio())
+        # Local ledger, kept current from fills; no REST round trip
+        update_inventory(client.get_position(INSTRUMENT)["quantity"])
 
         if (
             bid_cl_ord_id is None
@@ -14,12 +14,7 @@ client = PaperBrokerClient(
 )
 
 try:
-    client.connect()
-
-    # Wait for logon
-    while client.get_session_id() is None:
-        print("[WAITING] Waiting for FIX logon...")
-        time.sleep(0.2)
+    client.connect()  # blocks until FIX logon
 
     cl_ord_id = client.place_order("HNXDS:VN30F2508", "BUY", qty=1, price=1650)
     print(f"[STEP 1] Placed order: {cl_ord_id}")
@@ -18,12 +18,7 @@ client = PaperBrokerClient(
 )
 
 try:
-    client.connect()
-
-    # Wait until FIX session is established
-    while client.get_session_id() is None:
-        print("[WAITING] Waiting for FIX logon...")
-        time.sleep(0.2)
+    client.connect()  # blocks until FIX logon
 
     # === STOCK ORDER ===
     print("\n=== STOCK ORDER FLOW ===")
@@ -17,12 +17,7 @@ client = PaperBrokerClient(
 )
 
 try:
-    client.connect()
-
-    # Wait until the FIX session is fully established
-    while client.get_session_id() is None:
-        print("[WAITING] Waiting for FIX logon...")
-        time.sleep(0.2)
+    client.connect()  # blocks until FIX logon
 
     # Step 0: Fetch initial remain balance before placing order
     remain_balance = client.get_remain_balance()
@@ -31,12 +31,6 @@ SYMBOL = os.getenv("INSTRUMENT", "EXCHANGE:SYMBOL")
 PRICE = float(os.getenv("INIT_PRICE", "1610"))
 
 
-def wait_for_logon(*clients):
-    while any(c.get_session_id() is None for c in clients):
-        print("[WAITING] Waiting for FIX logons...")
-        time.sleep(0.2)
-
-
 def match_orders(buyer, seller, side_buyer, qty, price):
     """Place opposite orders to ensure match"""
     cl_b = buyer.place_order(SYMBOL, side_buyer, qty=qty, price=price)
@@ -56,7 +50,6 @@ def print_balance_step(step, qty, side):
 try:
     combat.connect()
     ask_bot.connect()
-    wait_for_logon(combat, ask_bot)
 
     print("\n=== INITIAL BALANCE ===")
     init_balance = combat.get_remain_balance()
@@ -41,13 +41,6 @@ DEFAULT_STEPS = [
 ]
 
 
-def wait_for_logon(*clients):
-    """Wait until all clients have established FIX logon."""
-    while any(c.get_session_id() is None for c in clients):
-        print("[WAITING] Waiting for FIX logons...")
-        time.sleep(0.2)
-
-
 def match_orders(buyer, seller, side_buyer, qty, price):
     """Send opposite orders to guarantee a match (with cancel/replace demo)."""
     cl_b = buyer.place_order(SYMBOL, side_buyer, qty=qty, price=price)
@@ -83,7 +76,6 @@ def load_steps():
 try:
     combat.connect()
     ask_bot.connect()
-    wait_for_logon(combat, ask_bot)
 
     print("\n=== INITIAL BALANCE ===")
     init_balance = combat.get_remain_balance()
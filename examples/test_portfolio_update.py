@@ -53,7 +53,6 @@ def get_latest_matched_price(timeout: int = 1):
 
 try:
     client.connect()
-    time.sleep(3)  # Allow time for connection
 
     # --- place a test order ---
     init_price = os.getenv("INIT_PRICE")
@@ -1,9 +1,8 @@
 # two_clients_order_matching.py
 
 import os
-import time
 from dotenv import load_dotenv
-from paperbroker import PaperBrokerClient
+from paperbroker import PaperBrokerClient, wait_all
 
 # Load environment variables
 load_dotenv()
@@ -29,15 +28,10 @@ seller = PaperBrokerClient(
 )
 
 try:
-    # Connect both clients
+    # Connect both clients; connect() returns once each is logged on
     buyer.connect()
     seller.connect()
 
-    # Wait until both FIX sessions are fully established
-    while buyer.get_session_id() is None or seller.get_session_id() is None:
-        print("[WAITING] Waiting for both FIX logons...")
-        time.sleep(0.2)
-
     print("\n=== INITIAL BALANCES ===")
     print("[BUYER] Remain Balance:", buyer.get_remain_balance())
     print("[BUYER] Total Balance:", buyer.get_total_balance())
@@ -47,15 +41,19 @@ try:
     print("[SELLER] Portfolio:", seller.get_portfolio())
 
     # Step 1: Buyer places a BUY order
-    cl_buy = buyer.place_order("HNXDS:VN30F2508", "BUY", qty=1, price=1610)
+    cl_buy = buyer.place_order(
+        "HNXDS:VN30F2508", "BUY", qty=1, price=1610, return_handle=True
+    )
     print(f"[STEP 1] Buyer placed order: {cl_buy}")
 
     # Step 2: Seller places a SELL order that should match
-    cl_sell = seller.place_order("HNXDS:VN30F2508", "SELL", qty=1, price=1610)
+    cl_sell = seller.place_order(
+        "HNXDS:VN30F2508", "SELL", qty=1, price=1610, return_handle=True
+    )
     print(f"[STEP 2] Seller placed order: {cl_sell}")
 
-    # Allow time for matching
-    time.sleep(3)
+    # Wait for matching (returns as soon as both orders are done)
+    wait_all([cl_buy, cl_sell], timeout=3)
 
     # Step 3: Check order status for both sides
     print("[STEP 3] Buyer order status:", buyer.get_order_status(cl_buy))
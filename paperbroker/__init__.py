@@ -1 +1,36 @@
-from .client import PaperBrokerClient
+import importlib
+
+from .session.order_handle import OrderFinished, OrderHandle, OrderRejected, wait_all
+from .session.order_store import RetentionPolicy
+from .session.risk import RiskLimits, RiskRejected
+
+# These need quickfix (and requests), so they are imported on first use;
+# the pure-Python modules (order store, journal, ledger, decoders, ...) then
+# load without either installed
+_LAZY = {
+    "PaperBrokerClient": ".client",
+    "PaperBrokerPool": ".pool",
+    "SessionConfig": ".session.session_config",
+}
+
+__all__ = [
+    "OrderFinished",
+    "OrderHandle",
+    "OrderRejected",
+    "PaperBrokerClient",
+    "PaperBrokerPool",
+    "RetentionPolicy",
+    "RiskLimits",
+    "RiskRejected",
+    "SessionConfig",
+    "wait_all",
+]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,6 +1,16 @@
+import asyncio
+import functools
 from paperbroker.rest.rest_session import RestSession
 from paperbroker.rest.account_client import AccountClient
+from paperbroker.session.event_bus import ACK, CANCEL, FILL, REJECT, SESSION_STATE
+from paperbroker.session.journal import OrderJournal
+from paperbroker.session.latency_probe import LatencyProbe
+from paperbroker.session.order_store import RetentionPolicy
+from paperbroker.session.risk import RiskLimits
+from paperbroker.session.send_scheduler import SendScheduler
+from paperbroker.session.session_config import SessionConfig
 from paperbroker.session.session_manager import FIXSessionManager
+from typing import Optional, Union
 
 
 class PaperBrokerClient:
@@ -9,22 +19,77 @@ class PaperBrokerClient:
         account: str,
         username: str,
         password: str,
-        cfg_path: str,
+        cfg_path: Union[str, dict, SessionConfig],
         log_dir: str = "logs",
         rest_base_url: str = "http://localhost:8000",
         console: bool = False,
+        retention: Optional[RetentionPolicy] = None,
+        mass_cancel: bool = False,
+        multipliers: Optional[dict] = None,
+        risk_limits: Optional[RiskLimits] = None,
+        send_rate: Optional[float] = None,
+        send_burst: int = 10,
+        id_generator=None,
+        resync: Optional[str] = "status",
+        journal_path: Optional[str] = None,
+        auto_reconnect: bool = True,
+        store: Optional[str] = None,
+        message_log: Optional[str] = None,
+        probe_interval: Optional[float] = None,
+        async_logging: bool = False,
+        event_log: Optional[str] = None,
+        session=None,
+        rest_session: Optional[RestSession] = None,
     ):
-        self.session = FIXSessionManager(
+        # `session`/`rest_session` are passed in by PaperBrokerPool so many
+        # clients share one initiator and one HTTP connection pool
+        self.session = session or FIXSessionManager(
             cfg_path=cfg_path,
             account=account,
             username=username,
             password=password,
             log_dir=log_dir,
             console=console,
+            retention=retention,
+            auto_reconnect=auto_reconnect,
+            store=store,
+            message_log=message_log,
+            async_logging=async_logging,
+            event_log=event_log,
         )
+        if id_generator is not None:
+            self.session.app.order_manager.id_generator = id_generator
+        # Use OrderMassCancelRequest in cancel_all (server must support 35=q)
+        self.session.app.order_manager.mass_cancel_supported = mass_cancel
+        # Order status refresh on every logon: "status", "mass" or None
+        if resync not in ("status", "mass", None):
+            raise ValueError(f"resync must be 'status', 'mass' or None: {resync!r}")
+        self.session.app.order_manager.resync_mode = resync
+        # Contract size per instrument, for ledger cash and P&L
+        self.ledger = self.session.app.order_manager.ledger
+        self.ledger.multipliers.update(multipliers or {})
+        # Pre-trade checks; orders that fail raise RiskRejected before sending
+        self.session.app.order_manager.set_risk_limits(risk_limits)
+        # Optional throttle: send_rate messages/second, cancels first
+        if send_rate:
+            self.session.app.order_manager.set_scheduler(
+                SendScheduler(
+                    rate=send_rate, burst=send_burst, logger=self.session.logger
+                )
+            )
+
+        # TestRequest/Heartbeat round trips every probe_interval seconds
+        if probe_interval:
+            self.session.app.set_probe(
+                LatencyProbe(logger=self.session.logger, interval=probe_interval)
+            )
+
+        # Crash-safe order journal, replayed by connect()
+        if journal_path:
+            self.session.app.order_manager.set_journal(OrderJournal(journal_path))
 
         # REST clients
-        self.rest_session = RestSession(rest_base_url)
+        self.rest_session = rest_session or RestSession(rest_base_url)
         self.account_client = AccountClient(
             rest_session=self.rest_session,
             username=username,
@@ -32,13 +97,67 @@ class PaperBrokerClient:
             console=console,
         )
 
-    def connect(self):
+    def connect(self, wait_logon: bool = True, timeout: float = 30.0):
+        """
+        Start the FIX session and, by default, block until it is logged on.
+        Raises TimeoutError if there is no logon within `timeout` seconds.
+        """
+        self._prepare_connect()
         self.session.start()
+        if wait_logon and not self.session.wait_logon(timeout):
+            raise TimeoutError(f"FIX session did not log on within {timeout}s")
+        self._sync_account()
+
+    def _prepare_connect(self):
+        # Restore orders/positions from the journal before the server
+        # reconciles them (resync on logon, REST ledger seed)
+        self.session.app.order_manager.replay_journal()
+        self.session.app.events.start()
+        if self.session.app.order_manager.scheduler is not None:
+            self.session.app.order_manager.scheduler.start()
+        if self.session.app.probe is not None:
+            self.session.app.probe.start()
+
+    def _sync_account(self):
         # Resolve accountID immediately on connect
         self.account_client.resolve_on_connect()
+        self.sync_ledger()
+
+    async def connect_async(self, timeout: float = 30.0):
+        """connect() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self.connect, wait_logon=True, timeout=timeout)
+        )
+
+    def wait_logon(self, timeout=None):
+        """Block until the FIX session is logged on; False on timeout."""
+        return self.session.wait_logon(timeout)
+
+    def session_stats(self):
+        """Logon state, uptime and logon/logout/reconnect counts."""
+        return self.session.supervisor.stats()
+
+    def session_health(self):
+        """
+        Link quality for deciding when to back off: logged_on plus, with
+        probe_interval set, the rolling TestRequest round-trip percentiles
+        (µs), last RTT, server clock offset, lost probes and seconds since
+        the last reply.
+        """
+        health = {"logged_on": self.session.supervisor.stats()["logged_on"]}
+        if self.session.app.probe is not None:
+            health.update(self.session.app.probe.health())
+        return health
 
     def disconnect(self):
+        if self.session.app.order_manager.scheduler is not None:
+            self.session.app.order_manager.scheduler.stop()
+        if self.session.app.probe is not None:
+            self.session.app.probe.stop()
         self.session.stop()
+        self.session.app.order_manager.flush()
+        self.session.app.events.stop()
 
     # FIX
     def place_order(
@@ -49,6 +168,7 @@ class PaperBrokerClient:
         price,
         ord_type="LIMIT",
         tif="GTC",
+        return_handle=False,
     ):
         return self.session.app.place_order(
             full_symbol=full_symbol,
@@ -57,17 +177,118 @@ class PaperBrokerClient:
             price=price,
             ord_type=ord_type,
             tif=tif,
+            return_handle=return_handle,
+        )
+
+    def place_orders(self, orders, return_handle=False):
+        return self.session.app.place_orders(
+            orders=orders, return_handle=return_handle
         )
 
     def cancel_order(self, cl_ord_id, timeout=2.0):
         return self.session.app.cancel_order(cl_ord_id=cl_ord_id, timeout=timeout)
 
+    def cancel_all(self, full_symbol=None, side=None, timeout=2.0):
+        return self.session.app.cancel_all(
+            full_symbol=full_symbol, side=side, timeout=timeout
+        )
+
+    def replace_order(self, cl_ord_id, price=None, qty=None, timeout=2.0):
+        return self.session.app.replace_order(
+            cl_ord_id=cl_ord_id, price=price, qty=qty, timeout=timeout
+        )
+
     def get_order_status(self, cl_ord_id):
         return self.session.app.get_order_status(cl_ord_id)
 
+    def wait_for_status(self, cl_ord_id, statuses, timeout=None):
+        return self.session.app.wait_for_status(
+            cl_ord_id=cl_ord_id, statuses=statuses, timeout=timeout
+        )
+
+    def get_order_history(self, cl_ord_id):
+        """Recent execution events of one order, oldest first (bounded)."""
+        return [
+            {
+                "exec_type": event.exec_type,
+                "status": event.status.label,
+                "qty": event.qty,
+                "px": event.px,
+                "transact_ns": event.transact_ns,
+                "exec_id": event.exec_id,
+            }
+            for event in self.session.app.order_manager.get_order_history(cl_ord_id)
+        ]
+
+    def get_order_fill(self, cl_ord_id):
+        """Cumulative filled qty and average price, kept from trade reports."""
+        record = self.session.app.order_manager.get_order(cl_ord_id)
+        if record is None:
+            return None
+        return {"cum_qty": record.cum_qty, "avg_px": record.avg_px}
+
     def get_session_id(self):
         return self.session.app.get_session_id()
 
+    # Callbacks (run on the event worker thread, or on `loop` if given)
+    def on_fill(self, callback, loop=None):
+        return self.session.app.events.subscribe(FILL, callback, loop)
+
+    def on_ack(self, callback, loop=None):
+        return self.session.app.events.subscribe(ACK, callback, loop)
+
+    def on_cancel(self, callback, loop=None):
+        return self.session.app.events.subscribe(CANCEL, callback, loop)
+
+    def on_reject(self, callback, loop=None):
+        return self.session.app.events.subscribe(REJECT, callback, loop)
+
+    def on_session_state(self, callback, loop=None):
+        return self.session.app.events.subscribe(SESSION_STATE, callback, loop)
+
+    def send_metrics(self):
+        """Queue depth and wait times of the send throttle (empty if off)."""
+        scheduler = self.session.app.order_manager.scheduler
+        return scheduler.metrics() if scheduler is not None else {}
+
+    def latency_stats(self, percentiles=(50, 90, 99, 99.9), reset=False):
+        """
+        Order-path latency in microseconds, measured with a monotonic clock
+        from send to ack, each fill, cancel ack and replace ack.
+        """
+        latency = self.session.app.order_manager.latency
+        stats = latency.stats(percentiles)
+        if reset:
+            latency.reset()
+        return stats
+
+    # Pre-trade risk
+    def set_risk_limits(self, risk_limits):
+        return self.session.app.order_manager.set_risk_limits(risk_limits)
+
+    def set_reference_price(self, full_symbol, price):
+        """Reference price for the risk price collar (defaults to last fill)."""
+        gate = self.session.app.order_manager.risk_gate
+        if gate is not None:
+            gate.set_reference_price(full_symbol, price)
+
+    # Local ledger
+    def sync_ledger(self):
+        """Re-seed local positions and cash from the REST API."""
+        self.session.app.order_manager.seed_ledger(
+            portfolio=self.account_client.get_portfolio() or None,
+            remain_balance=self.account_client.get_remain_balance() or None,
+        )
+
+    def get_position(self, full_symbol):
+        return self.ledger.get_position(full_symbol)
+
+    def get_positions(self):
+        return self.ledger.get_positions()
+
+    def get_cash(self):
+        return self.ledger.cash
+
     # REST
     def get_remain_balance(self):
         return self.account_client.get_remain_balance()
@@ -88,7 +309,9 @@ class PaperBrokerClient:
         return self.account_client.get_transactions()
 
     def get_executions_by_order(self, cl_ord_id):
-        order_id = self.session.app.order_manager.order_id_map[cl_ord_id]
+        order_id = self.session.app.order_manager.get_order_id(cl_ord_id)
+        if order_id is None:
+            raise KeyError(f"No OrderID known for {cl_ord_id}")
         return self.account_client.get_executions_by_order(order_id)
 
     def get_executions_by_account(self):
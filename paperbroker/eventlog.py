@@ -0,0 +1,158 @@
+"""
+Structured event log: one compact JSON object per log record, extra fields
+included.
+
+    {"ts": 1760777733.565, "level": "INFO", "event": "account_id_resolved",
+     "msg": "event=account_id_resolved", "username": "u1", "accountID": "A1"}
+
+A message of the form "event=<name>" also sets "event". Writes go through
+a large file buffer, flushed at most every flush_interval seconds (and by
+AsyncLogWriter after each batch). The file rotates to <path>.<timestamp>
+once it passes max_bytes or has been open for rotate_interval seconds.
+iter_events() reads the current and rotated files back one line at a time.
+"""
+
+import glob
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
+class EventLogHandler(logging.Handler):
+    def __init__(
+        self,
+        path,
+        max_bytes=64 << 20,
+        rotate_interval=None,
+        backup_count=10,
+        flush_interval=1.0,
+        buffer_size=1 << 16,
+    ):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._open()
+
+    def _open(self):
+        self._file = open(
+            self.path, "a", encoding="utf-8", buffering=self.buffer_size
+        )
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+        self._flushed_at = self._opened_at
+
+    def to_dict(self, record):
+        msg = record.getMessage().replace("\x01", "|")
+        event = {"ts": record.created, "level": record.levelname}
+        if msg.startswith("event="):
+            event["event"] = msg[6:].split(" ", 1)[0]
+        event["msg"] = msg
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                event[key] = value
+        if record.exc_info:
+            event["exc"] = logging.Formatter().formatException(record.exc_info)
+        return event
+
+    def emit(self, record):
+        try:
+            line = json.dumps(
+                self.to_dict(record), separators=(",", ":"), default=str
+            )
+            self.acquire()
+            try:
+                if self._file is None:
+                    return
+                now = time.monotonic()
+                if self._should_rotate(now):
+                    self._rotate()
+                self._file.write(line + "\n")
+                self._size += len(line) + 1
+                if now - self._flushed_at >= self.flush_interval:
+                    self._file.flush()
+                    self._flushed_at = now
+            finally:
+                self.release()
+        except Exception:
+            self.handleError(record)
+
+    def _should_rotate(self, now):
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return bool(
+            self.rotate_interval and now - self._opened_at >= self.rotate_interval
+        )
+
+    def _rotate(self):
+        self._file.close()
+        # Microsecond timestamps keep rotated names unique and in order
+        target = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        while os.path.exists(target):
+            time.sleep(1e-6)
+            target = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        os.replace(self.path, target)
+        if self.backup_count:
+            for old in rotated_files(self.path)[: -self.backup_count]:
+                os.remove(old)
+        self._open()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._file is not None:
+                self._file.flush()
+                self._flushed_at = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        finally:
+            self.release()
+        super().close()
+
+
+def rotated_files(path):
+    """Rotated copies of `path`, oldest first."""
+    return sorted(glob.glob(f"{glob.escape(path)}.*"))
+
+
+def iter_events(path, include_rotated=True, event=None):
+    """
+    Yield the events in `path` (after its rotated files, oldest first) as
+    dicts, one line at a time. `event` keeps only that event name. Lines
+    that do not parse, like a half-written last line, are skipped.
+    """
+    files = rotated_files(path) if include_rotated else []
+    if os.path.exists(path):
+        files.append(path)
+    for name in files:
+        with open(name, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if event is None or record.get("event") == event:
+                    yield record
@@ -1,6 +1,12 @@
+import atexit
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler
+from typing import Optional
+from paperbroker.eventlog import EventLogHandler
 
 
 class FixFormatter(logging.Formatter):
@@ -10,28 +16,173 @@ class FixFormatter(logging.Formatter):
         return super().format(record)
 
 
-def get_logger(log_dir: str = "logs", console: bool = True) -> logging.Logger:
+class FixText:
+    """
+    A FIX message to log, turned into text only when a handler emits it.
+    QuickFIX frees or reuses message objects once the callback returns, so
+    callers pass the raw string (message.toString()) up front; the "|"
+    substitution and the prefix happen later (on the writer thread in async
+    mode).
+    """
+
+    __slots__ = ("prefix", "raw")
+
+    def __init__(self, prefix, raw):
+        self.prefix = prefix
+        self.raw = raw
+
+    def __str__(self):
+        return f"{self.prefix} {self.raw.replace(chr(1), '|')}"
+
+
+class BatchingFileHandler(logging.FileHandler):
+    """
+    FileHandler that leaves flushing to its caller, so an AsyncLogWriter can
+    write a whole batch of records and flush the file once.
+    """
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _EnqueueHandler(QueueHandler):
+    # QueueHandler.prepare() formats the record on the calling thread;
+    # hand it over untouched so formatting happens on the writer thread
+    def prepare(self, record):
+        return record
+
+
+class AsyncLogWriter:
+    """
+    Background thread draining a queue of log records into `handlers`.
+    Up to batch_size waiting records are written per pass, followed by one
+    flush per handler.
+    """
+
+    _STOP = object()
+
+    def __init__(self, records, handlers, batch_size=256):
+        self.records = records
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="paperbroker-log", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Write everything already queued, then stop."""
+        if self._thread is None:
+            return
+        self.records.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.records.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._STOP:
+                    stop = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if stop:
+                return
+
+
+_writer = None
+
+
+def get_logger(
+    log_dir: str = "logs",
+    console: bool = True,
+    async_logging: bool = False,
+    event_log: Optional[str] = None,
+) -> logging.Logger:
+    """
+    The shared "paperbroker" logger. Handlers and the DEBUG level are set
+    up by the first call only, so a level the application sets afterwards
+    sticks. With async_logging, records go through a queue to an
+    AsyncLogWriter thread, so the caller never waits on formatting or disk
+    writes.
+    event_log adds a JSON Lines EventLogHandler (INFO and up, extra fields
+    kept) writing to that path.
+    """
+    global _writer
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(
         log_dir, f"paperbroker_{datetime.now().strftime('%Y%m%d')}.log"
     )
 
     logger = logging.getLogger("paperbroker")
-    logger.setLevel(logging.DEBUG)
 
     # Prevent adding multiple handlers when reused
     if not logger.handlers:
+        logger.setLevel(logging.DEBUG)
         formatter = FixFormatter("[%(asctime)s] [%(levelname)s] %(message)s")
 
         # File handler
-        file_handler = logging.FileHandler(log_file)
+        handler_class = BatchingFileHandler if async_logging else logging.FileHandler
+        file_handler = handler_class(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers = [file_handler]
 
         # Optional console handler
         if console:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(FixFormatter("[%(levelname)s] %(message)s"))
-            logger.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        # Optional structured event log
+        if event_log:
+            event_handler = EventLogHandler(event_log)
+            event_handler.setLevel(logging.INFO)
+            handlers.append(event_handler)
+
+        if async_logging:
+            records = queue.SimpleQueue()
+            logger.addHandler(_EnqueueHandler(records))
+            _writer = AsyncLogWriter(records, handlers)
+            _writer.start()
+            atexit.register(stop_async_logging)
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
 
     return logger
+
+
+def stop_async_logging():
+    """
+    Flush and stop the async log writer, if one is running. Later records
+    go straight to its handlers.
+    """
+    global _writer
+    if _writer is None:
+        return
+    logger = logging.getLogger("paperbroker")
+    for handler in list(logger.handlers):
+        if isinstance(handler, _EnqueueHandler):
+            logger.removeHandler(handler)
+    _writer.stop()
+    for handler in _writer.handlers:
+        logger.addHandler(handler)
+    _writer = None
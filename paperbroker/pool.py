@@ -0,0 +1,107 @@
+import time
+from paperbroker.client import PaperBrokerClient
+from paperbroker.rest.rest_session import RestSession
+from paperbroker.session.session_pool import FIXSessionPool
+
+
+class PaperBrokerPool:
+    """
+    One PaperBrokerClient per account, all sharing a single SocketInitiator
+    (one thread and one message store for every session) and a single
+    pooled REST session.
+
+    accounts: dicts with account, username, password and sender_comp_id,
+        optionally target_comp_id and any PaperBrokerClient option for that
+        account (multipliers, risk_limits, journal_path, ...)
+    client_options: PaperBrokerClient options applied to every account
+    """
+
+    def __init__(
+        self,
+        cfg_path,
+        accounts,
+        log_dir: str = "logs",
+        rest_base_url: str = "http://localhost:8000",
+        console: bool = False,
+        **client_options,
+    ):
+        self.sessions = FIXSessionPool(
+            cfg_path,
+            log_dir=log_dir,
+            console=console,
+            store=client_options.pop("store", None),
+            message_log=client_options.pop("message_log", None),
+            async_logging=client_options.pop("async_logging", False),
+            event_log=client_options.pop("event_log", None),
+        )
+        self.rest_session = RestSession(
+            rest_base_url, pool_maxsize=max(10, len(accounts))
+        )
+        self.clients = {}
+        for spec in accounts:
+            options = dict(client_options)
+            options.update(spec)
+            account = options.pop("account")
+            username = options.pop("username")
+            password = options.pop("password")
+            session = self.sessions.add_account(
+                account,
+                username,
+                password,
+                sender_comp_id=options.pop("sender_comp_id"),
+                target_comp_id=options.pop("target_comp_id", None),
+                retention=options.get("retention"),
+            )
+            self.clients[account] = PaperBrokerClient(
+                account=account,
+                username=username,
+                password=password,
+                cfg_path=cfg_path,
+                log_dir=log_dir,
+                rest_base_url=rest_base_url,
+                console=console,
+                session=session,
+                rest_session=self.rest_session,
+                **options,
+            )
+
+    def __getitem__(self, account):
+        return self.clients[account]
+
+    def __iter__(self):
+        return iter(self.clients.values())
+
+    def __len__(self):
+        return len(self.clients)
+
+    def connect(self, wait_logon: bool = True, timeout: float = 30.0):
+        """
+        Start every session on the shared initiator and, by default, block
+        until all of them are logged on (TimeoutError otherwise).
+        """
+        # The initiator logs every account on at once, so each client must
+        # have replayed its journal and started its probe before any logon
+        # triggers its resync
+        for client in self.clients.values():
+            client._prepare_connect()
+        for client in self.clients.values():
+            client.session.start()
+        if wait_logon:
+            deadline = time.monotonic() + timeout
+            for account, client in self.clients.items():
+                remaining = max(0.0, deadline - time.monotonic())
+                if not client.wait_logon(remaining):
+                    raise TimeoutError(
+                        f"{account} did not log on within {timeout}s"
+                    )
+        for client in self.clients.values():
+            client._sync_account()
+
+    def disconnect(self):
+        for client in self.clients.values():
+            client.disconnect()
+        self.sessions.stop()
+        self.rest_session.close()
+
+    def session_stats(self):
+        return {account: c.session_stats() for account, c in self.clients.items()}
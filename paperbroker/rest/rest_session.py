@@ -1,18 +1,28 @@
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class RestSession:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, pool_maxsize: int = 10):
         self.base_url = base_url.rstrip("/")
+        # Keep-alive connections, reused across calls (and across the
+        # clients of a PaperBrokerPool, which share one RestSession)
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
 
     def post(self, path: str, json: dict):
         url = f"{self.base_url}{path}"
-        response = requests.post(url, json=json)
+        response = self.http.post(url, json=json)
         response.raise_for_status()
         return response.json()
 
     def get(self, path: str, params: dict = None):
         url = f"{self.base_url}{path}"
-        response = requests.get(url, params=params)
+        response = self.http.get(url, params=params)
         response.raise_for_status()
         return response.json()
+
+    def close(self):
+        self.http.close()
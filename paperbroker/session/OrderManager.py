@@ -1,35 +1,223 @@
-from datetime import datetime, timezone
+import threading
 import time
-import uuid
 import quickfix as fix
 import quickfix44 as fix44
+from . import event_bus
+from .event_bus import EventBus
+from .exec_decoder import decode_execution_report
+from .ids import ClOrdIdGenerator
+from .latency import LatencyTracker
+from .ledger import Ledger
+from .risk import RiskGate, RiskRejected
+from .send_scheduler import (
+    PRIORITY_CANCEL,
+    PRIORITY_NEW,
+    PRIORITY_REPLACE,
+    PRIORITY_STATUS,
+)
+from .order_handle import OrderFinished, OrderHandle
+from .order_store import OrderEvent, OrderRecord, OrderStatus, OrderStore, Side
+from .order_template import (
+    OrderTemplate,
+    extract_exchange_and_symbol,
+    ord_type_field,
+    time_in_force_field,
+)
+
+_APPLIES_TO_ORIGINAL = frozenset(
+    (OrderStatus.CANCELED, OrderStatus.PENDING_CANCEL, OrderStatus.PENDING_REPLACE)
+)
+
+_EXEC_TYPE_EVENTS = {
+    fix.ExecType_NEW: event_bus.ACK,
+    fix.ExecType_REPLACED: event_bus.ACK,
+    fix.ExecType_TRADE: event_bus.FILL,
+    fix.ExecType_CANCELED: event_bus.CANCEL,
+    fix.ExecType_REJECTED: event_bus.REJECT,
+}
+
+# Which LatencyTracker histogram a report closes
+_EXEC_TYPE_LATENCY = {
+    fix.ExecType_NEW: "ack",
+    fix.ExecType_TRADE: "fill",
+    fix.ExecType_CANCELED: "cancel",
+    fix.ExecType_REPLACED: "replace",
+}
 
 
 class OrderManager:
-    def __init__(self, logger):
+    def __init__(
+        self,
+        logger,
+        retention=None,
+        ledger=None,
+        id_generator=None,
+        events=None,
+        stamper=None,
+    ):
         self.logger = logger
         self.session_id = None
-        self.clord_map = {}
-        self.order_info = {}
-        self.status_map = {}  # cl_ord_id -> {"status": str, "time": datetime}
-        self.order_id_map = {}
+        # Callable returning a fresh ClOrdID
+        self.id_generator = id_generator or ClOrdIdGenerator()
+        # Positions/cash updated from trade reports
+        self.ledger = ledger or Ledger()
+        # Optional RiskGate; see set_risk_limits()
+        self.risk_gate = None
+        # Optional SendScheduler; None sends straight to QuickFIX
+        self.scheduler = None
+        # Send -> ack/fill/cancel latency histograms
+        self.latency = LatencyTracker()
+        # Optional OrderJournal; see set_journal()
+        self.journal = None
+        # Order events for user callbacks (see EventBus)
+        self.events = events or EventBus(logger=logger)
+        # OrderRecords by ClOrdID and OrderID; finished orders are evicted
+        # per the RetentionPolicy
+        self.orders = OrderStore(retention)
+
+        # One lock guards all order state; each waiting order gets its own
+        # Condition on that lock so a report only wakes the threads that care.
+        self._lock = threading.Lock()
+        self._waiters = {}  # cl_ord_id -> [threading.Condition, waiter count]
+        self._handles = {}  # cl_ord_id -> OrderHandle, until the order is done
+        self._templates = {}  # (full_symbol, side, ord_type, tif) -> OrderTemplate
+        # OutboundStamper whose Username/Account fields templates carry
+        # pre-set, so toApp has nothing to add to new orders
+        self.stamper = stamper
+
+        # Set when the server accepts OrderMassCancelRequest (35=q)
+        self.mass_cancel_supported = False
+        # How resync() refreshes orders after a logon: "status" sends an
+        # OrderStatusRequest (35=H) per open order, "mass" one
+        # OrderMassStatusRequest (35=AF), None nothing
+        self.resync_mode = "status"
+        # Whether ExecType I replies book fills missed while disconnected.
+        # resync() turns it on; a REST ledger seed turns it off, since the
+        # seeded positions already contain those fills.
+        self._book_missed_fills = False
 
     def set_session(self, session_id):
         self.session_id = session_id
 
     def generate_ord_id(self):
-        return str(uuid.uuid4())[:8]
+        return self.id_generator()
 
     def extract_exchange_and_symbol(self, full_symbol: str):
         """
         Converts 'HSX:MWG' -> ('HSX', 'MWG')
         """
-        if ":" not in full_symbol:
-            raise ValueError(
-                f"Invalid symbol format: {full_symbol}, expected EXCHANGE:SYMBOL"
+        return extract_exchange_and_symbol(full_symbol)
+
+    def set_risk_limits(self, limits):
+        """Install a RiskGate for these RiskLimits (None turns checks off)."""
+        self.risk_gate = (
+            RiskGate(limits, self.orders, self.ledger) if limits is not None else None
+        )
+        return self.risk_gate
+
+    def set_scheduler(self, scheduler):
+        """Route sends through a SendScheduler (None sends directly)."""
+        if scheduler is not None:
+            scheduler.on_sent = self._mark_sent
+        self.scheduler = scheduler
+        return scheduler
+
+    def set_journal(self, journal):
+        """Append order and ledger events to an OrderJournal (None stops)."""
+        self.journal = journal
+        return journal
+
+    def replay_journal(self):
+        """
+        Rebuild orders, ExecIDs and the ledger from the journal, then
+        compact it down to the open orders. Returns the open order count.
+        """
+        if self.journal is None:
+            return 0
+        started = time.perf_counter()
+        records, exec_ids = self.journal.replay(self.ledger)
+        with self._lock:
+            for record in records.values():
+                if record.cl_ord_id not in self.orders:
+                    self.orders.add(record)
+            for exec_id in exec_ids:
+                self.orders.exec_ids.add(exec_id)
+            open_records = [
+                record for record in records.values() if not record.status.is_terminal
+            ]
+            self.journal.compact(open_records, *self.ledger.snapshot())
+        self.logger.info(
+            f"[JOURNAL] Replayed {len(records)} orders ({len(open_records)} open) "
+            f"in {(time.perf_counter() - started) * 1e3:.1f} ms"
+        )
+        return len(open_records)
+
+    def _maybe_compact_journal(self):
+        """
+        Compact the journal down to the open orders once it has grown
+        enough. Called on the report thread after a fill is journaled, so
+        no fill is between the ledger and the journal at that point.
+        """
+        journal = self.journal
+        if journal is None or not journal.needs_compaction():
+            return
+        started = time.perf_counter()
+        with self._lock:
+            before = journal.size
+            open_records = self.orders.open_orders()
+            journal.compact(open_records, *self.ledger.snapshot())
+        self.logger.info(
+            f"[JOURNAL] Compacted {before} -> {journal.size} bytes "
+            f"({len(open_records)} open orders) in "
+            f"{(time.perf_counter() - started) * 1e3:.1f} ms"
+        )
+
+    def journal_ledger(self):
+        """Checkpoint the ledger into the journal, e.g. after a seed."""
+        if self.journal is not None:
+            self.journal.seed(*self.ledger.snapshot())
+
+    def seed_ledger(self, portfolio=None, remain_balance=None):
+        """
+        Reset the ledger from a REST snapshot (see Ledger.seed) and journal
+        it. Once a portfolio has been applied, resync replies handled after
+        this no longer book missed fills; without one (e.g. the REST call
+        failed) the ledger is unchanged and they still do.
+        """
+        with self._lock:
+            self.ledger.seed(portfolio=portfolio, remain_balance=remain_balance)
+            if portfolio is not None:
+                self._book_missed_fills = False
+            self.journal_ledger()
+
+    def _journal(self, *records, exec_id=""):
+        # Caller holds self._lock so journal order matches state changes
+        journal = self.journal
+        if journal is not None:
+            for record in records:
+                if record is not None:
+                    journal.update(record, exec_id)
+
+    def _mark_sent(self, cl_ord_id, priority, sent_ns):
+        # Called by the SendScheduler as a queued message goes on the wire
+        record = self.orders.get(cl_ord_id)
+        if record is None:
+            return
+        if priority == PRIORITY_CANCEL:
+            record.cancel_sent_ns = sent_ns
+        else:
+            record.sent_ns = sent_ns
+
+    def get_order_template(self, full_symbol, side, ord_type="LIMIT", tif="GTC"):
+        """Return the cached NewOrderSingle template for this instrument/side."""
+        key = (full_symbol, side.upper(), ord_type, tif)
+        template = self._templates.get(key)
+        if template is None:
+            stamp_fields = self.stamper.fields if self.stamper is not None else ()
+            template = self._templates.setdefault(
+                key, OrderTemplate(full_symbol, side, ord_type, tif, stamp_fields)
             )
-        exchange, symbol = full_symbol.split(":", 1)
-        return exchange, symbol
+        return template
 
     def place_order(
         self,
@@ -39,191 +227,789 @@ class OrderManager:
         price,
         ord_type="LIMIT",
         tif="GTC",
+        return_handle=False,
     ):
+        return self.place_orders(
+            [(full_symbol, side, qty, price, ord_type, tif)],
+            return_handle=return_handle,
+        )[0]
+
+    def place_orders(self, orders, return_handle=False):
+        """
+        Send a batch of new orders. Each spec is a tuple
+        (full_symbol, side, qty, price[, ord_type[, tif]]) or a dict with
+        the same keys as place_order. Returns ClOrdIDs (or OrderHandles)
+        in the same order as the specs.
+        """
         if not self.session_id:
             raise RuntimeError("FIX session is not established.")
 
-        exchange, symbol = self.extract_exchange_and_symbol(full_symbol)
-        cl_ord_id = self.generate_ord_id()
+        # Resolve everything up front so a bad spec fails before anything is sent
+        prepared = []
+        batch_open = {}  # full_symbol -> orders earlier in this batch
+        batch_qty = {}  # (full_symbol, Side) -> their qty
+        for spec in orders:
+            if isinstance(spec, dict):
+                spec = (
+                    spec["full_symbol"],
+                    spec["side"],
+                    spec["qty"],
+                    spec["price"],
+                    spec.get("ord_type", "LIMIT"),
+                    spec.get("tif", "GTC"),
+                )
+            full_symbol, side, qty, price, *rest = spec
+            template = self.get_order_template(full_symbol, side, *rest)
+            if self.risk_gate is not None:
+                self._risk_check(template, qty, price, batch_open, batch_qty)
+            prepared.append((template, self.generate_ord_id(), qty, price))
+
+        # Register state before sending so an early ack cannot be missed
+        now_ns = time.time_ns()
+        results = []
+        records = []
+        with self._lock:
+            for template, cl_ord_id, qty, price in prepared:
+                record = OrderRecord(
+                    cl_ord_id,
+                    exchange=template.exchange,
+                    symbol=template.symbol,
+                    side=Side.parse(template.side),
+                    qty=qty,
+                    price=price,
+                    time_ns=now_ns,
+                    ord_type=template.ord_type,
+                    tif=template.tif,
+                )
+                self.orders.add(record)
+                records.append(record)
+                if self.journal is not None:
+                    self.journal.order(record)
+                if return_handle:
+                    handle = self._handles[cl_ord_id] = OrderHandle(cl_ord_id)
+                    results.append(handle)
+                else:
+                    results.append(cl_ord_id)
+
+        session_id = self.session_id
+        scheduler = self.scheduler
+        for (template, cl_ord_id, qty, price), record in zip(prepared, records):
+            if scheduler is not None:
+                scheduler.submit(
+                    template.build(cl_ord_id, qty, price),
+                    session_id,
+                    PRIORITY_NEW,
+                    cl_ord_id,
+                )
+                self.logger.info(f"[ORDER] Queued new order: {cl_ord_id}")
+                continue
+            # Stamp before sending so an ack racing back always sees it
+            record.sent_ns = time.monotonic_ns()
+            if template.send(cl_ord_id, qty, price, session_id):
+                self.logger.info(f"[ORDER] Sent new order: {cl_ord_id}")
+            else:
+                self.logger.error("Failed to send order")
 
-        side = side.upper()
+        return results
 
-        order = fix44.NewOrderSingle()
-        order.setField(fix.ClOrdID(cl_ord_id))
-        order.setField(fix.Symbol(symbol))  # Keep full symbol for consistency
-        order.setField(fix.SecurityExchange(exchange))
-        order.setField(fix.Side(fix.Side_BUY if side == "BUY" else fix.Side_SELL))
-        order.setField(fix.OrderQty(qty))
-        order.setField(fix.Price(price))
-        order.setField(
-            fix.OrdType(
-                fix.OrdType_LIMIT if ord_type == "LIMIT" else fix.OrdType_MARKET
+    def _risk_check(self, template, qty, price, batch_open, batch_qty):
+        full_symbol = template.full_symbol
+        side = Side.parse(template.side)
+        pending = batch_open.get(full_symbol, 0)
+        pending_qty = batch_qty.get((full_symbol, side), 0)
+        try:
+            self.risk_gate.check(
+                full_symbol, side, qty, price, pending, pending_qty=pending_qty
             )
-        )
-        order.setField(
-            fix.TimeInForce(
-                fix.TimeInForce_GOOD_TILL_CANCEL
-                if tif == "GTC"
-                else fix.TimeInForce_IMMEDIATE_OR_CANCEL
+        except RiskRejected as e:
+            self.logger.warning(
+                f"[RISK] Rejected {template.side} {qty} {full_symbol} @ {price}: {e}"
             )
-        )
-        order.setField(fix.TransactTime())
+            raise
+        batch_open[full_symbol] = pending + 1
+        batch_qty[(full_symbol, side)] = pending_qty + qty
 
-        if fix.Session.sendToTarget(order, self.session_id):
-            self.logger.info(f"[ORDER] Sent new order: {cl_ord_id}")
-        else:
-            self.logger.error("Failed to send order")
+    def _wait(self, cl_ord_id, predicate, timeout):
+        """
+        Block until predicate() holds for cl_ord_id or timeout expires.
+        Woken by on_execution_report; no polling. Returns the predicate result.
+        """
+        with self._lock:
+            entry = self._waiters.get(cl_ord_id)
+            if entry is None:
+                entry = [threading.Condition(self._lock), 0]
+                self._waiters[cl_ord_id] = entry
+            entry[1] += 1
+            try:
+                return entry[0].wait_for(predicate, timeout)
+            finally:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._waiters[cl_ord_id]
+
+    def _notify(self, *cl_ord_ids):
+        # Caller must hold self._lock
+        for cl_ord_id in cl_ord_ids:
+            entry = self._waiters.get(cl_ord_id)
+            if entry is not None:
+                entry[0].notify_all()
+
+    def wait_for_status(self, cl_ord_id, statuses, timeout=None):
+        """
+        Block until the order reaches one of `statuses` (e.g. "New", "Filled").
+        Returns the status reached, or None on timeout.
+        """
+        cl_ord_id = str(cl_ord_id)  # accept an OrderHandle as well
+        if isinstance(statuses, str):
+            statuses = (statuses,)
+        statuses = frozenset(statuses)
 
-        self.order_info[cl_ord_id] = {
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "exchange": exchange,
-        }
-        self.status_map[cl_ord_id] = {
-            "status": "PendingNew",
-            "time": datetime.now(timezone.utc),
-        }
+        def reached():
+            return self.get_order_status(cl_ord_id) in statuses
 
-        return cl_ord_id
+        if self._wait(cl_ord_id, reached, timeout):
+            return self.get_order_status(cl_ord_id)
+        return None
 
-    def cancel_order(self, cl_ord_id, timeout=2.0):
-        start = datetime.now()
-        while cl_ord_id not in self.order_id_map:
-            if (datetime.now() - start).total_seconds() > timeout:
-                raise Exception(f"Timeout waiting for OrderID for {cl_ord_id}")
-        time.sleep(0.05)  # small wait
+    def _acked_record(self, cl_ord_id, timeout):
+        """
+        Wait until the server has assigned an OrderID and return the record.
+        Raises OrderFinished as soon as the order is final (it may never get
+        an OrderID, e.g. when rejected) and TimeoutError after `timeout`.
+        """
+
+        def ready():
+            record = self.orders.lookup(cl_ord_id)
+            return record is not None and (
+                record.order_id is not None or record.status.is_terminal
+            )
+
+        if not self._wait(cl_ord_id, ready, timeout):
+            raise TimeoutError(f"Timeout waiting for OrderID for {cl_ord_id}")
+        record = self.orders.lookup(cl_ord_id)
+        if record.status.is_terminal:
+            raise OrderFinished(cl_ord_id, record.status.label)
         if not self.session_id:
             raise RuntimeError("FIX session is not established.")
+        return record
 
+    def _send(self, message, priority, record=None):
+        """Send now, or hand to the SendScheduler when one is installed."""
+        cl_ord_id = record.cl_ord_id if record is not None else None
+        if self.scheduler is not None:
+            return self.scheduler.submit(message, self.session_id, priority, cl_ord_id)
+        if record is not None:
+            self._mark_sent(cl_ord_id, priority, time.monotonic_ns())
+        return fix.Session.sendToTarget(message, self.session_id)
+
+    def _drop_queued(self, cl_ord_id):
+        """
+        Cancel a new order that the scheduler has not sent yet: neither the
+        order nor its cancel goes on the wire. Returns True if that happened.
+        """
+        if self.scheduler is None or not self.scheduler.drop_new(cl_ord_id):
+            return False
+        self.logger.info(f"[CANCELED] {cl_ord_id} withdrawn before sending")
+        with self._lock:
+            record = self.orders.get(cl_ord_id)
+            if record is not None:
+                self.orders.set_status(record, OrderStatus.CANCELED, time.time_ns())
+                self._journal(record)
+            self._notify(cl_ord_id)
+            handle = self._handles.pop(cl_ord_id, None)
+        if handle is not None:
+            handle._update("Canceled")
+        if self.events.wants(event_bus.CANCEL):
+            self.events.publish(
+                event_bus.CANCEL,
+                {"cl_ord_id": cl_ord_id, "status": "Canceled", "text": "withdrawn"},
+            )
+        return True
+
+    def cancel_order(self, cl_ord_id, timeout=2.0):
+        cl_ord_id = str(cl_ord_id)  # accept an OrderHandle as well
+        if self._drop_queued(cl_ord_id):
+            return
+        record = self._acked_record(cl_ord_id, timeout)
+        self._send_cancel(record)
+
+    def _send_cancel(self, record):
+        cl_ord_id = record.cl_ord_id
         cancel_cl_ord_id = f"{cl_ord_id}-CXL"
-        ord_id = self.order_id_map[cl_ord_id]
-        info = self.order_info[cl_ord_id]
 
         cancel = fix44.OrderCancelRequest()
         cancel.setField(fix.OrigClOrdID(cl_ord_id))
         cancel.setField(fix.ClOrdID(cancel_cl_ord_id))
-        cancel.setField(fix.OrderID(ord_id))
-        cancel.setField(fix.Symbol(info["symbol"]))
-        cancel.setField(
-            fix.SecurityExchange(info.get("exchange", ""))
-        )  # fallback empty if missing
+        cancel.setField(fix.OrderID(record.order_id))
+        cancel.setField(fix.Symbol(record.symbol))
+        cancel.setField(fix.SecurityExchange(record.exchange))
         cancel.setField(
-            fix.Side(fix.Side_BUY if info["side"] == "BUY" else fix.Side_SELL)
+            fix.Side(fix.Side_BUY if record.side == Side.BUY else fix.Side_SELL)
         )
-        cancel.setField(fix.OrderQty(info["qty"]))
+        cancel.setField(fix.OrderQty(record.qty))
         cancel.setField(fix.TransactTime())
 
-        if fix.Session.sendToTarget(cancel, self.session_id):
+        if self._send(cancel, PRIORITY_CANCEL, record):
             self.logger.debug(f"[ORDER] Sent cancel request: {cancel_cl_ord_id}")
         else:
             self.logger.error("Failed to send cancel request")
 
-        self.status_map[cl_ord_id] = {
-            "status": "PendingCancel",
-            "time": datetime.now(timezone.utc),
-        }
+        with self._lock:
+            self.orders.set_status(
+                record, OrderStatus.PENDING_CANCEL, time.time_ns()
+            )
+            self._journal(record)
 
-    def on_execution_report(self, message):
-        try:
-            msg_type = message.getHeader().getField(fix.MsgType().getTag())
-            if msg_type == fix.MsgType_OrderCancelReject:
-                cl_ord_id = message.getField(fix.ClOrdID().getTag())
-                order_id = (
-                    message.getField(fix.OrderID().getTag())
-                    if message.isSetField(fix.OrderID().getTag())
-                    else "?"
-                )
-                text = (
-                    message.getField(fix.Text().getTag())
-                    if message.isSetField(fix.Text().getTag())
-                    else "Unknown reason"
-                )
-                rej_reason = (
-                    message.getField(fix.CxlRejReason().getTag())
-                    if message.isSetField(fix.CxlRejReason().getTag())
-                    else "?"
-                )
+    def cancel_all(self, full_symbol=None, side=None, timeout=2.0):
+        """
+        Cancel every open order, optionally only for one 'EXCHANGE:SYMBOL'
+        and/or side. Uses a single OrderMassCancelRequest (35=q) when
+        mass_cancel_supported is set; otherwise sends individual cancels
+        back to back, only waiting (with one shared deadline) for orders
+        that have not been acked yet. Returns the ClOrdIDs targeted.
+        """
+        if not self.session_id:
+            raise RuntimeError("FIX session is not established.")
+        side = Side.parse(side) if side is not None else None
+
+        if self.mass_cancel_supported:
+            return self._send_mass_cancel(full_symbol, side)
+
+        with self._lock:
+            targets = [
+                record
+                for record in self.orders.open_orders(full_symbol, side)
+                if record.status
+                not in (OrderStatus.PENDING_CANCEL, OrderStatus.PENDING_REPLACE)
+            ]
+
+        unacked = []
+        for record in targets:
+            if record.order_id:
+                self._send_cancel(record)
+            elif not self._drop_queued(record.cl_ord_id):
+                unacked.append(record)
+
+        deadline = time.monotonic() + timeout
+        for record in unacked:
+            remaining = max(0.0, deadline - time.monotonic())
+            acked = self._wait(
+                record.cl_ord_id, lambda r=record: r.order_id is not None, remaining
+            )
+            if acked:
+                if not record.status.is_terminal:
+                    self._send_cancel(record)
+            else:
                 self.logger.warning(
-                    f"[CANCEL_REJECTED] Cancel for {cl_ord_id} (orderID={order_id}) was rejected (reason={rej_reason}): {text}"
+                    f"[CANCEL_ALL] No OrderID for {record.cl_ord_id}; not canceled"
                 )
-                return
 
-            cl_ord_id = message.getField(fix.ClOrdID().getTag())
-            ord_status = message.getField(fix.OrdStatus().getTag())
-            exec_type = message.getField(fix.ExecType().getTag())
-            ord_id = message.getField(fix.OrderID().getTag())
-            transact_time_str = message.getField(fix.TransactTime().getTag())
-            transact_time = datetime.strptime(
-                transact_time_str, "%Y%m%d-%H:%M:%S.%f"
-            ).replace(tzinfo=timezone.utc)
-
-            self.order_id_map[cl_ord_id] = ord_id
-            if ord_id:
-                self.clord_map[ord_id] = cl_ord_id
-
-            status = self.map_status(ord_status)
-
-            if exec_type == fix.ExecType_REJECTED:
-                text = (
-                    message.getField(fix.Text().getTag())
-                    if message.isSetField(fix.Text().getTag())
-                    else "No reason"
+        return [record.cl_ord_id for record in targets]
+
+    def _send_mass_cancel(self, full_symbol, side):
+        with self._lock:
+            targets = self.orders.open_orders(full_symbol, side)
+
+        request = fix44.OrderMassCancelRequest()
+        request.setField(fix.ClOrdID(f"{self.generate_ord_id()}-MCXL"))
+        if full_symbol is not None:
+            exchange, symbol = extract_exchange_and_symbol(full_symbol)
+            request.setField(
+                fix.MassCancelRequestType(
+                    fix.MassCancelRequestType_CANCEL_ORDERS_FOR_A_SECURITY
                 )
-                self.logger.warning(
-                    f"[REJECTED] Order {cl_ord_id} was rejected: {text}"
+            )
+            request.setField(fix.Symbol(symbol))
+            request.setField(fix.SecurityExchange(exchange))
+        else:
+            request.setField(
+                fix.MassCancelRequestType(fix.MassCancelRequestType_CANCEL_ALL_ORDERS)
+            )
+        if side is not None:
+            request.setField(
+                fix.Side(fix.Side_BUY if side == Side.BUY else fix.Side_SELL)
+            )
+        request.setField(fix.TransactTime())
+
+        if self._send(request, PRIORITY_CANCEL):
+            self.logger.info(
+                f"[ORDER] Sent mass cancel (symbol={full_symbol or '*'}, "
+                f"side={side.name if side is not None else '*'})"
+            )
+        else:
+            self.logger.error("Failed to send mass cancel request")
+        return [record.cl_ord_id for record in targets]
+
+    def replace_order(self, cl_ord_id, price=None, qty=None, timeout=2.0):
+        """
+        Amend price and/or qty of a live order with one OrderCancelReplaceRequest
+        (35=G). Returns the ClOrdID of the amended order; any OrderHandle for
+        the original order follows it once the replace is acked.
+        """
+        cl_ord_id = str(cl_ord_id)  # accept an OrderHandle as well
+        if price is None and qty is None:
+            raise ValueError("replace_order needs a new price and/or qty")
+        record = self._acked_record(cl_ord_id, timeout)
+
+        new_cl_ord_id = self.generate_ord_id()
+        new_qty = record.qty if qty is None else qty
+        new_price = record.price if price is None else price
+        if self.risk_gate is not None:
+            try:
+                self.risk_gate.check(
+                    record.full_symbol,
+                    record.side,
+                    new_qty,
+                    new_price,
+                    new_order=False,
+                    replaced_qty=record.qty,
                 )
-            elif exec_type == fix.ExecType_TRADE:
-                last_px = float(message.getField(fix.LastPx().getTag()))
-                last_qty = float(message.getField(fix.LastQty().getTag()))
+            except RiskRejected as e:
+                self.logger.warning(f"[RISK] Rejected replace of {cl_ord_id}: {e}")
+                raise
+
+        replace = fix44.OrderCancelReplaceRequest()
+        replace.setField(fix.OrigClOrdID(cl_ord_id))
+        replace.setField(fix.ClOrdID(new_cl_ord_id))
+        replace.setField(fix.OrderID(record.order_id))
+        replace.setField(fix.Symbol(record.symbol))
+        replace.setField(fix.SecurityExchange(record.exchange))
+        replace.setField(
+            fix.Side(fix.Side_BUY if record.side == Side.BUY else fix.Side_SELL)
+        )
+        replace.setField(ord_type_field(record.ord_type))
+        replace.setField(time_in_force_field(record.tif))
+        replace.setField(fix.OrderQty(new_qty))
+        replace.setField(fix.Price(new_price))
+        replace.setField(fix.TransactTime())
+
+        now_ns = time.time_ns()
+        with self._lock:
+            amended = OrderRecord(
+                new_cl_ord_id,
+                exchange=record.exchange,
+                symbol=record.symbol,
+                side=record.side,
+                qty=new_qty,
+                price=new_price,
+                time_ns=now_ns,
+                ord_type=record.ord_type,
+                tif=record.tif,
+            )
+            amended.orig_cl_ord_id = cl_ord_id
+            self.orders.add(amended)
+            record.replaced_by = new_cl_ord_id
+            self.orders.set_status(record, OrderStatus.PENDING_REPLACE, now_ns)
+            if self.journal is not None:
+                self.journal.order(amended)
+                self._journal(record)
+
+        if self._send(replace, PRIORITY_REPLACE, amended):
+            self.logger.info(
+                f"[ORDER] Sent replace request: {cl_ord_id} -> {new_cl_ord_id}"
+            )
+        else:
+            self.logger.error("Failed to send replace request")
+
+        return new_cl_ord_id
+
+    def resync(self):
+        """
+        Ask the server for the current state of our orders, e.g. after a
+        reconnect. The replies are ExecutionReports with ExecType I that
+        on_report merges like any other report. Returns the number of
+        requests sent.
+        """
+        if not self.session_id or self.resync_mode is None:
+            return 0
+        with self._lock:
+            self._book_missed_fills = True
+
+        if self.resync_mode == "mass":
+            request = fix44.OrderMassStatusRequest()
+            request.setField(fix.MassStatusReqID(f"{self.generate_ord_id()}-MSR"))
+            request.setField(
+                fix.MassStatusReqType(fix.MassStatusReqType_STATUS_FOR_ALL_ORDERS)
+            )
+            if self._send(request, PRIORITY_STATUS):
+                self.logger.info("[RESYNC] Sent order mass status request")
+                return 1
+            self.logger.error("Failed to send order mass status request")
+            return 0
+
+        with self._lock:
+            targets = self.orders.open_orders()
+        sent = 0
+        for record in targets:
+            request = fix44.OrderStatusRequest()
+            request.setField(fix.ClOrdID(record.cl_ord_id))
+            if record.order_id:
+                request.setField(fix.OrderID(record.order_id))
+            request.setField(fix.Symbol(record.symbol))
+            request.setField(fix.SecurityExchange(record.exchange))
+            request.setField(
+                fix.Side(fix.Side_BUY if record.side == Side.BUY else fix.Side_SELL)
+            )
+            if self._send(request, PRIORITY_STATUS):
+                sent += 1
+        self.logger.info(
+            f"[RESYNC] Requested status of {sent}/{len(targets)} open orders"
+        )
+        return sent
+
+    def on_execution_report(self, message, raw=None):
+        """Decode and apply an inbound report; raw is message.toString()."""
+        received_ns = time.monotonic_ns()
+        try:
+            if raw is None:
+                raw = message.toString()
+            self.on_report(decode_execution_report(raw), received_ns)
+        except Exception as e:
+            self.logger.error(f"Failed to process execution report: {e}")
+
+    def on_report(self, report, received_ns=None):
+        """
+        Apply a decoded ExecReport to the order store. received_ns is
+        time.monotonic_ns() when the message arrived, for latency stats.
+        """
+        if received_ns is None:
+            received_ns = time.monotonic_ns()
+        cl_ord_id = report.cl_ord_id
+        if report.msg_type == fix.MsgType_OrderCancelReject:
+            self._on_cancel_reject(report)
+            return
+        if report.msg_type == fix.MsgType_OrderMassCancelReport:
+            # Individual orders still get their own Canceled reports
+            self.logger.info(
+                f"[MASS_CANCEL] {cl_ord_id} response={report.mass_cancel_response} "
+                f"{report.text}"
+            )
+            return
+
+        # A report resent after a reconnect carries an ExecID already applied.
+        # Status replies are snapshots and may all share a placeholder ExecID.
+        exec_id = report.exec_id
+        exec_type = report.exec_type
+        if exec_id and exec_type != fix.ExecType_ORDER_STATUS:
+            with self._lock:
+                fresh = self.orders.exec_ids.add(exec_id)
+            if not fresh:
+                self.logger.debug(f"[DUPLICATE] ExecID {exec_id} for {cl_ord_id}")
+                return
+
+        ord_id = report.order_id
+        status = OrderStatus.from_fix(report.ord_status)
+
+        text = ""
+        if exec_type == fix.ExecType_REJECTED:
+            text = report.text or "No reason"
+            self.logger.warning(f"[REJECTED] Order {cl_ord_id} was rejected: {text}")
+        elif exec_type == fix.ExecType_TRADE:
+            self.logger.info(
+                f"[TRADE] {cl_ord_id}: Traded {report.last_qty} @ {report.last_px} "
+                f"at {report.transact_time}"
+            )
+        elif exec_type == fix.ExecType_PENDING_CANCEL:
+            self.logger.debug(
+                f"[PENDING_CANCEL] {report.orig_cl_ord_id} pending cancel "
+                f"at {report.transact_time}"
+            )
+        elif exec_type == fix.ExecType_CANCELED:
+            self.logger.info(
+                f"[CANCELED] {report.orig_cl_ord_id} was canceled "
+                f"at {report.transact_time}"
+            )
+        elif exec_type == fix.ExecType_NEW:
+            self.logger.info(
+                f"[NEW] Order {cl_ord_id} accepted at {report.transact_time}"
+            )
+        elif exec_type == fix.ExecType_REPLACED:
+            self.logger.info(
+                f"[REPLACED] {report.orig_cl_ord_id} replaced by {cl_ord_id} "
+                f"at {report.transact_time}"
+            )
+        elif exec_type == fix.ExecType_ORDER_STATUS:
+            self.logger.debug(
+                f"[STATUS] {cl_ord_id} is {status.label} "
+                f"(filled {report.cum_qty} @ {report.avg_px})"
+            )
+            if report.last_rpt_requested:
                 self.logger.info(
-                    f"[TRADE] {cl_ord_id}: Traded {last_qty} @ {last_px} at {transact_time.isoformat()}"
+                    f"[RESYNC] Mass status {report.mass_status_req_id} done"
                 )
-            elif exec_type == fix.ExecType_PENDING_CANCEL:
-                orig_cl_ord_id = message.getField(fix.OrigClOrdID().getTag())
-                self.logger.debug(
-                    f"[PENDING_CANCEL] {orig_cl_ord_id} pending cancel at {transact_time.isoformat()}"
+
+        # Cancel/pending-replace reports carry the request's own ClOrdID;
+        # state belongs to the original order named in OrigClOrdID
+        orig_cl_ord_id = None
+        if status in _APPLIES_TO_ORIGINAL:
+            orig_cl_ord_id = report.orig_cl_ord_id or None
+        target = orig_cl_ord_id or cl_ord_id
+        if not target:
+            self.logger.warning(f"[REPORT] Ignoring report without ClOrdID: {report}")
+            return
+        transact_ns = report.transact_ns
+
+        if exec_type == fix.ExecType_REPLACED and report.orig_cl_ord_id:
+            self._on_replaced(report)
+
+        with self._lock:
+            record = self.orders.get(target)
+            known = record is not None
+            if not known:
+                record = self.orders.add(
+                    OrderRecord(
+                        target,
+                        exchange=report.exchange,
+                        symbol=report.symbol,
+                        side=Side.parse(report.side),
+                        qty=report.order_qty,
+                        price=report.price,
+                        time_ns=0,
+                    )
                 )
-            elif exec_type == fix.ExecType_CANCELED:
-                orig_cl_ord_id = message.getField(fix.OrigClOrdID().getTag())
-                self.logger.info(
-                    f"[CANCELED] {orig_cl_ord_id} was canceled at {transact_time.isoformat()}"
+                if self.journal is not None:
+                    self.journal.order(record)
+            elif not record.symbol and report.symbol:
+                self.orders.reindex(
+                    record, report.exchange, report.symbol, Side.parse(report.side)
                 )
-            elif exec_type == fix.ExecType_NEW:
-                self.logger.info(
-                    f"[NEW] Order {cl_ord_id} accepted at {transact_time.isoformat()}"
+            self.orders.set_order_id(record, ord_id)
+
+            if exec_type == fix.ExecType_ORDER_STATUS:
+                # A status snapshot is current as of now, whatever its time
+                if status != OrderStatus.UNKNOWN:
+                    self.orders.set_status(
+                        record, status, max(transact_ns, record.time_ns)
+                    )
+                missed_fill = self._merge_fills(record, report)
+                if missed_fill is not None and known and self._book_missed_fills:
+                    # Booked under the lock so a concurrent seed_ledger()
+                    # either precedes it or overwrites it
+                    self._book_missed_fill(record, *missed_fill)
+                # Otherwise not ours to book, or already in the seeded ledger
+                record.transact_ns = max(record.transact_ns, transact_ns)
+            elif status != OrderStatus.UNKNOWN and (
+                not transact_ns or transact_ns >= record.transact_ns
+            ):
+                # TransactTime has ms precision: reports stamped in the same
+                # ms apply in arrival order
+                self.orders.set_status(
+                    record, status, transact_ns or time.time_ns()
                 )
+                record.transact_ns = max(record.transact_ns, transact_ns)
+            if exec_type == fix.ExecType_TRADE:
+                self.orders.apply_fill(record, report.last_qty, report.last_px)
+            self.orders.add_event(
+                record,
+                OrderEvent(
+                    exec_type,
+                    status,
+                    report.last_qty,
+                    report.last_px,
+                    transact_ns,
+                    exec_id,
+                ),
+            )
+            self._journal(record, exec_id=exec_id)
+            current = record.status
+            trade_symbol = record.full_symbol if record.symbol else None
+            is_buy = record.side == Side.BUY
+            side_name = record.side.name
+            sent_ns = record.sent_ns
+            cancel_sent_ns = record.cancel_sent_ns
+
+            self._notify(cl_ord_id, orig_cl_ord_id)
+            handle = self._handles.get(target)
+
+        latency_name = _EXEC_TYPE_LATENCY.get(exec_type)
+        if latency_name is not None:
+            self.latency.record(
+                latency_name,
+                cancel_sent_ns if latency_name == "cancel" else sent_ns,
+                received_ns,
+            )
 
-            if ord_status in ["4", "6"]:
-                if message.isSetField(fix.OrigClOrdID().getTag()):
-                    orig_cl_ord_id = message.getField(fix.OrigClOrdID().getTag())
-                    prev = self.status_map.get(orig_cl_ord_id)
-                    if prev is None or transact_time > prev["time"]:
-                        self.status_map[orig_cl_ord_id] = {
-                            "status": status,
-                            "time": transact_time,
-                        }
+        if exec_type == fix.ExecType_TRADE:
+            if trade_symbol is not None:
+                self.ledger.on_trade(
+                    trade_symbol, is_buy, report.last_qty, report.last_px
+                )
+                if self.journal is not None:
+                    self.journal.fill(
+                        trade_symbol, is_buy, report.last_qty, report.last_px
+                    )
             else:
-                prev = self.status_map.get(cl_ord_id)
-                if prev is None or transact_time > prev["time"]:
-                    self.status_map[cl_ord_id] = {
-                        "status": status,
-                        "time": transact_time,
-                    }
+                self.logger.warning(
+                    f"[LEDGER] Trade for unknown order {target} not applied"
+                )
+        self._maybe_compact_journal()
 
-        except Exception as e:
-            self.logger.error(f"Failed to process execution report: {e}")
+        # Futures run their callbacks inline, so resolve outside the lock
+        if handle is not None:
+            if handle._update(current.label, ord_id, text):
+                with self._lock:
+                    self._handles.pop(target, None)
+
+        event = _EXEC_TYPE_EVENTS.get(exec_type)
+        if event is not None and self.events.wants(event):
+            self.events.publish(
+                event,
+                {
+                    "cl_ord_id": target,
+                    "order_id": ord_id,
+                    "exec_type": exec_type,
+                    "status": current.label,
+                    "instrument": trade_symbol,
+                    "side": side_name,
+                    "last_qty": report.last_qty,
+                    "last_px": report.last_px,
+                    "transact_time": report.transact_time,
+                    "text": report.text,
+                },
+            )
+
+    def _merge_fills(self, record, report):
+        """
+        Take CumQty/AvgPx from a status report. Returns (qty, avg price) of
+        fills the record had not seen, or None. Caller must hold self._lock.
+        """
+        if report.cum_qty <= record.cum_qty:
+            return None
+        qty = report.cum_qty - record.cum_qty
+        value = report.cum_qty * report.avg_px - record.cum_qty * record.avg_px
+        self.orders.set_fills(record, report.cum_qty, report.avg_px)
+        return qty, value / qty
+
+    def _book_missed_fill(self, record, qty, px):
+        # Caller must hold self._lock
+        if not record.symbol:
+            return
+        full_symbol = record.full_symbol
+        is_buy = record.side == Side.BUY
+        self.logger.info(
+            f"[RESYNC] {record.cl_ord_id}: {qty} @ {px} filled while disconnected"
+        )
+        self.ledger.on_trade(full_symbol, is_buy, qty, px)
+        if self.journal is not None:
+            self.journal.fill(full_symbol, is_buy, qty, px)
+
+    def _on_replaced(self, report):
+        """Retire the original order and move its handle to the amendment."""
+        orig_cl_ord_id = report.orig_cl_ord_id
+        new_cl_ord_id = report.cl_ord_id
+        with self._lock:
+            orig = self.orders.get(orig_cl_ord_id)
+            if orig is not None:
+                orig.replaced_by = new_cl_ord_id
+                self.orders.set_status(
+                    orig, OrderStatus.REPLACED, max(orig.time_ns, report.transact_ns)
+                )
+                orig.transact_ns = max(orig.transact_ns, report.transact_ns)
+
+            amended = self.orders.get(new_cl_ord_id)
+            if amended is None and orig is not None:
+                amended = OrderRecord(
+                    new_cl_ord_id,
+                    exchange=orig.exchange,
+                    symbol=orig.symbol,
+                    side=orig.side,
+                    qty=orig.qty,
+                    price=orig.price,
+                    time_ns=0,
+                    ord_type=orig.ord_type,
+                    tif=orig.tif,
+                )
+                self.orders.add(amended)
+                if self.journal is not None:
+                    self.journal.order(amended)
+            if amended is not None:
+                amended.orig_cl_ord_id = orig_cl_ord_id
+                if orig is not None:
+                    # Fills so far belong to the whole replace chain
+                    self.orders.set_fills(amended, orig.cum_qty, orig.avg_px)
+            self._journal(orig, amended)
+
+            handle = self._handles.pop(orig_cl_ord_id, None)
+            if handle is not None:
+                handle.cl_ord_id = new_cl_ord_id
+                self._handles[new_cl_ord_id] = handle
+            self._notify(orig_cl_ord_id)
+
+    def _on_cancel_reject(self, report):
+        """
+        OrderCancelReject (35=9) for a cancel or a replace. The original
+        order goes back to the status the server reports; a rejected
+        replace also marks its would-be amendment Rejected.
+        """
+        is_replace = report.cxl_rej_response_to == "2"
+        kind = "Replace" if is_replace else "Cancel"
+        self.logger.warning(
+            f"[{kind.upper()}_REJECTED] {kind} for {report.cl_ord_id} "
+            f"(orderID={report.order_id or '?'}) was rejected "
+            f"(reason={report.cxl_rej_reason or '?'}): "
+            f"{report.text or 'Unknown reason'}"
+        )
+
+        status = OrderStatus.from_fix(report.ord_status)
+        with self._lock:
+            orig = self.orders.get(report.orig_cl_ord_id)
+            if orig is not None and orig.status in (
+                OrderStatus.PENDING_CANCEL,
+                OrderStatus.PENDING_REPLACE,
+            ):
+                if status == OrderStatus.UNKNOWN:
+                    status = OrderStatus.NEW
+                self.orders.set_status(orig, status)
+                if is_replace:
+                    orig.replaced_by = None
+
+            if is_replace:
+                amended = self.orders.get(report.cl_ord_id)
+                if amended is not None:
+                    self.orders.set_status(amended, OrderStatus.REJECTED)
+                    self._journal(amended)
+            self._journal(orig)
+            self._notify(report.cl_ord_id, report.orig_cl_ord_id)
+
+        if self.events.wants(event_bus.REJECT):
+            self.events.publish(
+                event_bus.REJECT,
+                {
+                    "cl_ord_id": report.orig_cl_ord_id,
+                    "request_cl_ord_id": report.cl_ord_id,
+                    "order_id": report.order_id,
+                    "request": kind.lower(),
+                    "status": status.label,
+                    "text": report.text,
+                },
+            )
 
     def get_order_status(self, cl_ord_id):
-        entry = self.status_map.get(cl_ord_id)
-        return entry["status"] if entry else "Unknown"
+        record = self.orders.lookup(str(cl_ord_id))
+        return record.status.label if record else "Unknown"
+
+    def get_order_id(self, cl_ord_id):
+        record = self.orders.lookup(str(cl_ord_id))
+        return record.order_id if record else None
+
+    def get_order(self, cl_ord_id):
+        """Return the OrderRecord for cl_ord_id, or None if unknown."""
+        return self.orders.lookup(str(cl_ord_id))
+
+    def get_order_history(self, cl_ord_id):
+        """The order's recent OrderEvents, oldest first."""
+        with self._lock:
+            record = self.orders.lookup(str(cl_ord_id))
+            if record is None or record.history is None:
+                return []
+            return list(record.history)
+
+    def flush(self):
+        """Flush the evicted-order archive and the journal, if configured."""
+        with self._lock:
+            self.orders.flush()
+        if self.journal is not None:
+            self.journal.flush()
 
     def map_status(self, fix_status):
-        return {
-            "0": "New",
-            "1": "PartiallyFilled",
-            "2": "Filled",
-            "4": "Canceled",
-            "6": "PendingCancel",
-            "8": "Rejected",
-        }.get(fix_status, "Unknown")
+        return OrderStatus.from_fix(fix_status).label
@@ -2,9 +2,12 @@ import quickfix as fix
 from typing import Optional
 from paperbroker.logger import get_logger
 from .OrderManager import OrderManager
+from .event_bus import SESSION_STATE, EventBus
+from .order_store import RetentionPolicy
 from .handler_logon import LogonHandler
 from .handler_admin import AdminHandler
 from .handler_app import AppHandler
+from .stamping import OutboundStamper
 
 
 class FIXApp(fix.Application):
@@ -15,10 +18,14 @@ class FIXApp(fix.Application):
         password: str,
         logger: Optional[str] = None,
         console: bool = False,
+        retention: Optional[RetentionPolicy] = None,
     ):
         super().__init__()
         self.logger = logger or get_logger(console=console)
 
+        # Username/Account fields for every outbound message, built once
+        self.stamper = OutboundStamper(account=account, username=username)
+
         # Handlers
         self.logon_handler = LogonHandler(logger=self.logger)
         self.admin_handler = AdminHandler(
@@ -26,19 +33,38 @@ class FIXApp(fix.Application):
             username=username,
             password=password,
             logger=self.logger,
+            stamper=self.stamper,
         )
         self.app_handler = AppHandler(
             account=account,
             username=username,
             password=password,
             logger=self.logger,
+            stamper=self.stamper,
         )
 
+        # Events for user callbacks, dispatched off the QuickFIX thread
+        self.events = EventBus(logger=self.logger)
+
         # Order manager
-        self.order_manager = OrderManager(logger=self.logger)
+        self.order_manager = OrderManager(
+            logger=self.logger,
+            retention=retention,
+            events=self.events,
+            stamper=self.stamper,
+        )
 
         # FIX session ID
         self.session_id = None
+        # SessionSupervisor told about logon/logout (set by FIXSessionManager)
+        self.supervisor = None
+        # Optional LatencyProbe (see set_probe)
+        self.probe = None
+
+    def set_probe(self, probe):
+        """Attach a LatencyProbe; it is fed from fromAdmin."""
+        self.probe = probe
+        self.admin_handler.probe = probe
 
     def onCreate(self, sessionID):
         self.logon_handler.on_create(sessionID)
@@ -47,9 +73,27 @@ class FIXApp(fix.Application):
         self.session_id = sessionID
         self.logon_handler.on_logon(sessionID)
         self.order_manager.set_session(sessionID)
+        try:
+            self.order_manager.resync()
+        except Exception as e:
+            self.logger.error(f"[RESYNC] Failed to request order status: {e}")
+        if self.supervisor is not None:
+            self.supervisor.on_logon()
+        if self.probe is not None:
+            self.probe.on_logon(sessionID)
+        self.events.publish(
+            SESSION_STATE, {"state": "logon", "session_id": str(sessionID)}
+        )
 
     def onLogout(self, sessionID):
         self.logon_handler.on_logout(sessionID)
+        if self.supervisor is not None:
+            self.supervisor.on_logout()
+        if self.probe is not None:
+            self.probe.on_logout()
+        self.events.publish(
+            SESSION_STATE, {"state": "logout", "session_id": str(sessionID)}
+        )
 
     def toAdmin(self, message, sessionID):
         self.admin_handler.to_admin(message, sessionID)
@@ -61,8 +105,10 @@ class FIXApp(fix.Application):
         self.app_handler.to_app(message, sessionID)
 
     def fromApp(self, message, sessionID):
-        self.app_handler.from_app(message, sessionID)
-        self.order_manager.on_execution_report(message)
+        # Serialize once for both the log line and the report decoder
+        raw = message.toString()
+        self.app_handler.from_app(message, sessionID, raw)
+        self.order_manager.on_execution_report(message, raw)
 
     def place_order(
         self,
@@ -72,6 +118,7 @@ class FIXApp(fix.Application):
         price,
         ord_type="LIMIT",
         tif="GTC",
+        return_handle=False,
     ):
         return self.order_manager.place_order(
             full_symbol=full_symbol,
@@ -80,13 +127,34 @@ class FIXApp(fix.Application):
             price=price,
             ord_type=ord_type,
             tif=tif,
+            return_handle=return_handle,
+        )
+
+    def place_orders(self, orders, return_handle=False):
+        return self.order_manager.place_orders(
+            orders=orders, return_handle=return_handle
         )
 
     def cancel_order(self, cl_ord_id, timeout=2.0):
         return self.order_manager.cancel_order(cl_ord_id=cl_ord_id, timeout=timeout)
 
+    def cancel_all(self, full_symbol=None, side=None, timeout=2.0):
+        return self.order_manager.cancel_all(
+            full_symbol=full_symbol, side=side, timeout=timeout
+        )
+
+    def replace_order(self, cl_ord_id, price=None, qty=None, timeout=2.0):
+        return self.order_manager.replace_order(
+            cl_ord_id=cl_ord_id, price=price, qty=qty, timeout=timeout
+        )
+
     def get_order_status(self, cl_ord_id):
         return self.order_manager.get_order_status(cl_ord_id)
 
+    def wait_for_status(self, cl_ord_id, statuses, timeout=None):
+        return self.order_manager.wait_for_status(
+            cl_ord_id=cl_ord_id, statuses=statuses, timeout=timeout
+        )
+
     def get_session_id(self):
         return self.session_id if self.session_id else None
@@ -0,0 +1,113 @@
+"""
+Trim a QuickFIX data dictionary to the messages this client exchanges.
+
+    python -m paperbroker.session.data_dictionary fix/FIX44.xml fix/FIX44-min.xml
+
+QuickFIX parses the whole XML on every session start and keeps every
+message definition around for validation. The trimmed file keeps the
+header, trailer, the session messages and the order-entry messages below,
+plus every component and field they reference, with the enum values of
+those fields, so validation of what actually flows is unchanged.
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+# Session (A, 0-5), BusinessMessageReject (j) and order entry / status
+MSG_TYPES = frozenset(
+    ("A", "0", "1", "2", "3", "4", "5", "j")
+    + ("D", "F", "G", "8", "9", "q", "r", "H", "AF")
+)
+
+
+def _references(element, components, fields, used_components):
+    """Collect field names (groups count as fields) under element."""
+    for child in element:
+        if child.tag in ("field", "group"):
+            fields.add(child.get("name"))
+            if child.tag == "group":
+                _references(child, components, fields, used_components)
+        elif child.tag == "component":
+            name = child.get("name")
+            if name not in used_components:
+                used_components.add(name)
+                definition = components.get(name)
+                if definition is not None:
+                    _references(definition, components, fields, used_components)
+
+
+def trim_dictionary(source, target, msg_types=MSG_TYPES):
+    """
+    Write a copy of the dictionary at `source` to `target` holding only
+    `msg_types`. Returns (messages kept, fields kept).
+    """
+    tree = ET.parse(source)
+    root = tree.getroot()
+    messages = root.find("messages")
+    component_section = root.find("components")
+    field_section = root.find("fields")
+    components = {}
+    if component_section is not None:
+        components = {c.get("name"): c for c in component_section}
+
+    fields = set()
+    used_components = set()
+    for section in (root.find("header"), root.find("trailer")):
+        if section is not None:
+            _references(section, components, fields, used_components)
+    for message in list(messages):
+        if message.get("msgtype") in msg_types:
+            _references(message, components, fields, used_components)
+        else:
+            messages.remove(message)
+    if component_section is not None:
+        for component in list(component_section):
+            if component.get("name") not in used_components:
+                component_section.remove(component)
+    for field in list(field_section):
+        if field.get("name") not in fields:
+            field_section.remove(field)
+
+    with open(target, "wb") as f:
+        tree.write(f, encoding="utf-8", xml_declaration=True)
+        f.write(b"\n")
+    return len(messages), len(field_section)
+
+
+def trimmed_path(source):
+    """fix/FIX44.xml -> fix/FIX44-min.xml"""
+    stem, ext = os.path.splitext(source)
+    return f"{stem}-min{ext}"
+
+
+def ensure_trimmed(source, target=None):
+    """
+    Path of the trimmed dictionary for `source`, regenerating it when it is
+    missing or older than `source`.
+    """
+    target = target or trimmed_path(source)
+    if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(
+        source
+    ):
+        trim_dictionary(source, target)
+    return target
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or len(argv) > 2:
+        print(
+            "usage: python -m paperbroker.session.data_dictionary "
+            "SOURCE.xml [TARGET.xml]"
+        )
+        return 2
+    source = argv[0]
+    target = argv[1] if len(argv) > 1 else trimmed_path(source)
+    messages, fields = trim_dictionary(source, target)
+    print(f"{target}: {messages} messages, {fields} fields")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
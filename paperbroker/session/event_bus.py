@@ -0,0 +1,96 @@
+import queue
+import threading
+
+FILL = "fill"
+ACK = "ack"
+CANCEL = "cancel"
+REJECT = "reject"
+SESSION_STATE = "session_state"
+
+EVENTS = (FILL, ACK, CANCEL, REJECT, SESSION_STATE)
+
+_STOP = object()
+
+
+class EventBus:
+    """
+    Hands events from the QuickFIX callback thread to user callbacks.
+
+    publish() only appends to a bounded queue and returns; a dedicated
+    worker thread runs the callbacks, so a slow callback never stalls the
+    socket reader (heartbeats keep flowing). When the queue is full new
+    events are dropped and counted in `dropped`. A callback subscribed
+    with an asyncio loop is scheduled onto that loop instead of run on the
+    worker.
+    """
+
+    def __init__(self, maxsize=100_000, logger=None):
+        self.maxsize = maxsize
+        self.logger = logger
+        self.dropped = 0
+        self._queue = queue.SimpleQueue()
+        self._subscribers = {}  # event -> tuple of (callback, loop)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, event, callback, loop=None):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event {event!r}, expected one of {EVENTS}")
+        with self._lock:
+            # Copy-on-write so publish/dispatch read without locking
+            self._subscribers[event] = self._subscribers.get(event, ()) + (
+                (callback, loop),
+            )
+        return callback
+
+    def unsubscribe(self, event, callback):
+        with self._lock:
+            self._subscribers[event] = tuple(
+                entry
+                for entry in self._subscribers.get(event, ())
+                if entry[0] is not callback
+            )
+
+    def wants(self, event):
+        """True if anything is subscribed, so callers can skip building payloads."""
+        return bool(self._subscribers.get(event))
+
+    def publish(self, event, payload):
+        if not self._subscribers.get(event):
+            return
+        if self._queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        self._queue.put((event, payload))
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="paperbroker-events", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop after dispatching what is already queued."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            event, payload = item
+            for callback, loop in self._subscribers.get(event, ()):
+                try:
+                    if loop is not None:
+                        loop.call_soon_threadsafe(callback, payload)
+                    else:
+                        callback(payload)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"[EVENT] {event} callback failed: {e}")
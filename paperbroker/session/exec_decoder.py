@@ -0,0 +1,125 @@
+from . import fix_tags as tags
+from .fix_time import parse_utc_timestamp_ns
+
+SOH = "\x01"
+
+# Tag keys as they appear in the raw message
+_MSG_TYPE = str(tags.MSG_TYPE)
+_CL_ORD_ID = str(tags.CL_ORD_ID)
+_ORIG_CL_ORD_ID = str(tags.ORIG_CL_ORD_ID)
+_ORDER_ID = str(tags.ORDER_ID)
+_EXEC_ID = str(tags.EXEC_ID)
+_EXEC_TYPE = str(tags.EXEC_TYPE)
+_ORD_STATUS = str(tags.ORD_STATUS)
+_TRANSACT_TIME = str(tags.TRANSACT_TIME)
+_LAST_PX = str(tags.LAST_PX)
+_LAST_QTY = str(tags.LAST_QTY)
+_TEXT = str(tags.TEXT)
+_CXL_REJ_REASON = str(tags.CXL_REJ_REASON)
+_CXL_REJ_RESPONSE_TO = str(tags.CXL_REJ_RESPONSE_TO)
+_MASS_CANCEL_RESPONSE = str(tags.MASS_CANCEL_RESPONSE)
+_SYMBOL = str(tags.SYMBOL)
+_SECURITY_EXCHANGE = str(tags.SECURITY_EXCHANGE)
+_SIDE = str(tags.SIDE)
+_ORDER_QTY = str(tags.ORDER_QTY)
+_PRICE = str(tags.PRICE)
+_CUM_QTY = str(tags.CUM_QTY)
+_AVG_PX = str(tags.AVG_PX)
+_MASS_STATUS_REQ_ID = str(tags.MASS_STATUS_REQ_ID)
+_LAST_RPT_REQUESTED = str(tags.LAST_RPT_REQUESTED)
+
+
+class ExecReport:
+    """
+    The fields OrderManager needs from an ExecutionReport (35=8),
+    OrderCancelReject (35=9) or OrderMassCancelReport (35=r). Missing
+    string fields are "" and missing numeric fields are 0; transact_ns
+    is epoch nanoseconds (0 if absent). The instrument, side, qty/price and
+    cumulative fill fields let a status report (ExecType I) rebuild an
+    order this process did not place.
+    """
+
+    __slots__ = (
+        "msg_type",
+        "cl_ord_id",
+        "orig_cl_ord_id",
+        "order_id",
+        "exec_id",
+        "exec_type",
+        "ord_status",
+        "transact_time",
+        "transact_ns",
+        "last_px",
+        "last_qty",
+        "text",
+        "cxl_rej_reason",
+        "cxl_rej_response_to",
+        "mass_cancel_response",
+        "symbol",
+        "exchange",
+        "side",
+        "order_qty",
+        "price",
+        "cum_qty",
+        "avg_px",
+        "mass_status_req_id",
+        "last_rpt_requested",
+    )
+
+    def __repr__(self):
+        return (
+            f"ExecReport(msg_type={self.msg_type!r}, cl_ord_id={self.cl_ord_id!r}, "
+            f"exec_type={self.exec_type!r}, ord_status={self.ord_status!r})"
+        )
+
+
+def decode_execution_report(raw):
+    """
+    Decode a raw SOH-delimited FIX message in a single split pass.
+    Repeating groups are not needed here, so later duplicates of a tag win.
+    """
+    fields = dict(field.split("=", 1) for field in raw.split(SOH) if field)
+    get = fields.get
+
+    report = ExecReport()
+    report.msg_type = get(_MSG_TYPE, "")
+    report.cl_ord_id = get(_CL_ORD_ID, "")
+    report.orig_cl_ord_id = get(_ORIG_CL_ORD_ID, "")
+    report.order_id = get(_ORDER_ID, "")
+    report.exec_id = get(_EXEC_ID, "")
+    report.exec_type = get(_EXEC_TYPE, "")
+    report.ord_status = get(_ORD_STATUS, "")
+    report.text = get(_TEXT, "")
+    report.cxl_rej_reason = get(_CXL_REJ_REASON, "")
+    report.cxl_rej_response_to = get(_CXL_REJ_RESPONSE_TO, "")
+    report.mass_cancel_response = get(_MASS_CANCEL_RESPONSE, "")
+    report.symbol = get(_SYMBOL, "")
+    report.exchange = get(_SECURITY_EXCHANGE, "")
+    report.side = get(_SIDE, "")
+    report.mass_status_req_id = get(_MASS_STATUS_REQ_ID, "")
+    report.last_rpt_requested = get(_LAST_RPT_REQUESTED) == "Y"
+
+    transact_time = get(_TRANSACT_TIME, "")
+    report.transact_time = transact_time
+    report.transact_ns = (
+        parse_utc_timestamp_ns(transact_time) if transact_time else 0
+    )
+
+    last_px = get(_LAST_PX)
+    report.last_px = float(last_px) if last_px else 0.0
+    last_qty = get(_LAST_QTY)
+    report.last_qty = _to_qty(last_qty) if last_qty else 0
+    order_qty = get(_ORDER_QTY)
+    report.order_qty = _to_qty(order_qty) if order_qty else 0
+    price = get(_PRICE)
+    report.price = float(price) if price else 0.0
+    cum_qty = get(_CUM_QTY)
+    report.cum_qty = _to_qty(cum_qty) if cum_qty else 0
+    avg_px = get(_AVG_PX)
+    report.avg_px = float(avg_px) if avg_px else 0.0
+    return report
+
+
+def _to_qty(value):
+    # Quantities are whole lots/contracts in practice; keep them ints
+    return int(value) if value.isdigit() else float(value)
@@ -0,0 +1,33 @@
+# Integer FIX 4.4 tags used on the order path. Kept as plain ints so hot code
+# can call getField/setField without constructing throwaway fix.* objects.
+
+ACCOUNT = 1
+AVG_PX = 6
+CL_ORD_ID = 11
+CUM_QTY = 14
+EXEC_ID = 17
+LAST_PX = 31
+LAST_QTY = 32
+MSG_TYPE = 35
+ORDER_ID = 37
+ORDER_QTY = 38
+ORD_STATUS = 39
+ORD_TYPE = 40
+ORIG_CL_ORD_ID = 41
+PRICE = 44
+SENDING_TIME = 52
+SIDE = 54
+SYMBOL = 55
+TEXT = 58
+TIME_IN_FORCE = 59
+TRANSACT_TIME = 60
+CXL_REJ_REASON = 102
+TEST_REQ_ID = 112
+EXEC_TYPE = 150
+LEAVES_QTY = 151
+SECURITY_EXCHANGE = 207
+CXL_REJ_RESPONSE_TO = 434
+MASS_CANCEL_RESPONSE = 531
+USERNAME = 553
+MASS_STATUS_REQ_ID = 584
+LAST_RPT_REQUESTED = 912
@@ -0,0 +1,54 @@
+import calendar
+import time
+
+# (epoch second, "YYYYMMDD-HH:MM:SS") swapped as one tuple so threads never
+# see a prefix from a different second
+_cached_second = (None, "")
+
+
+def format_utc_timestamp(ns=None):
+    """
+    Format epoch nanoseconds (default: now) as a FIX UTCTimestamp
+    'YYYYMMDD-HH:MM:SS.sss'. The date/time prefix is cached per second.
+    """
+    global _cached_second
+    if ns is None:
+        ns = time.time_ns()
+    second, rem = divmod(ns, 1_000_000_000)
+    cached, prefix = _cached_second
+    if second != cached:
+        prefix = time.strftime("%Y%m%d-%H:%M:%S", time.gmtime(second))
+        _cached_second = (second, prefix)
+    return f"{prefix}.{rem // 1_000_000:03d}"
+
+
+# "YYYYMMDD" -> epoch seconds at 00:00 UTC of that day
+_day_cache = {}
+# 10 ** (9 - digits) for 0..9 fractional digits
+_FRACTION_SCALE = tuple(10 ** (9 - n) for n in range(10))
+
+
+def parse_utc_timestamp_ns(value):
+    """
+    Parse a FIX UTCTimestamp 'YYYYMMDD-HH:MM:SS[.fff[fff[fff]]]' into epoch
+    nanoseconds. Fixed-offset slicing plus a per-day cache; much cheaper
+    than datetime.strptime.
+    """
+    day = value[:8]
+    base = _day_cache.get(day)
+    if base is None:
+        base = calendar.timegm(
+            (int(day[:4]), int(day[4:6]), int(day[6:8]), 0, 0, 0)
+        )
+        if len(_day_cache) > 64:
+            _day_cache.clear()
+        _day_cache[day] = base
+    seconds = (
+        base
+        + int(value[9:11]) * 3600
+        + int(value[12:14]) * 60
+        + int(value[15:17])
+    )
+    frac = value[18:]
+    nanos = int(frac) * _FRACTION_SCALE[len(frac)] if frac else 0
+    return seconds * 1_000_000_000 + nanos
@@ -1,22 +1,38 @@
+import logging
 import quickfix as fix
+from paperbroker.logger import FixText
+from . import fix_tags as tags
+from .stamping import OutboundStamper
 
 
 class AdminHandler:
-    def __init__(self, account, username, password, logger):
+    def __init__(self, account, username, password, logger, stamper=None):
         self.account = account
         self.username = username
         self.password = password
         self.logger = logger
+        self.stamper = stamper or OutboundStamper(account, username)
+        # LatencyProbe fed with Heartbeats answering its TestRequests
+        self.probe = None
 
     def to_admin(self, message, sessionID):
-        msg_type = message.getHeader().getField(fix.MsgType()).getString()
-        if msg_type == "A":  # Logon
+        if message.getHeader().getField(tags.MSG_TYPE) == "A":  # Logon
             message.setField(fix.Password(self.password))
             message.setField(fix.EncryptMethod(0))
             message.setField(fix.HeartBtInt(30))
-        message.setField(fix.Username(self.username))
-        message.setField(fix.Account(self.account))
-        self.logger.debug(f"[TO ADMIN] {message}")
+        self.stamper.stamp(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(FixText("[TO ADMIN]", message.toString()))
 
     def from_admin(self, message, sessionID):
-        self.logger.debug(f"[FROM ADMIN] {message}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(FixText("[FROM ADMIN]", message.toString()))
+        if self.probe is not None and message.isSetField(tags.TEST_REQ_ID):
+            header = message.getHeader()
+            if header.getField(tags.MSG_TYPE) == "0":  # Heartbeat
+                sending_time = None
+                if header.isSetField(tags.SENDING_TIME):
+                    sending_time = header.getField(tags.SENDING_TIME)
+                self.probe.on_heartbeat(
+                    message.getField(tags.TEST_REQ_ID), sending_time
+                )
@@ -1,17 +1,24 @@
-import quickfix as fix
+import logging
+from paperbroker.logger import FixText
+from .stamping import OutboundStamper
 
 
 class AppHandler:
-    def __init__(self, account, username, password, logger):
+    def __init__(self, account, username, password, logger, stamper=None):
         self.account = account
         self.username = username
         self.password = password
         self.logger = logger
+        self.stamper = stamper or OutboundStamper(account, username)
 
     def to_app(self, message, sessionID):
-        message.setField(fix.Username(self.username))
-        message.setField(fix.Account(self.account))
-        self.logger.debug(f"[TO APP] {message}")
+        self.stamper.stamp(message)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(FixText("[TO APP]", message.toString()))
 
-    def from_app(self, message, sessionID):
-        self.logger.info(f"[FROM APP] {message}")
+    def from_app(self, message, sessionID, raw=None):
+        # raw: message.toString(), if the caller already has it
+        if self.logger.isEnabledFor(logging.INFO):
+            if raw is None:
+                raw = message.toString()
+            self.logger.info(FixText("[FROM APP]", raw))
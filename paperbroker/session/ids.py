@@ -0,0 +1,49 @@
+import itertools
+import os
+import time
+import uuid
+
+# Lowercase base-36: safe even if the server compares IDs case-insensitively
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def encode_base36(n, width=0):
+    if n == 0:
+        digits = "0"
+    else:
+        chars = []
+        while n:
+            n, rem = divmod(n, 36)
+            chars.append(ALPHABET[rem])
+        digits = "".join(reversed(chars))
+    return digits.rjust(width, "0")
+
+
+class ClOrdIdGenerator:
+    """
+    ClOrdIDs made of a per-process session prefix plus a monotonic counter,
+    e.g. 'l8x2kq4a9z' + '1b'.
+
+    The prefix is the process start second (6 chars) plus 4 chars mixing
+    the PID with random bits, so two processes on the same account only
+    collide if they start in the same second and draw the same 4 chars.
+    The counter lives as long as the generator, so IDs stay unique across
+    FIX reconnects. next() is a counter bump plus a short base-36 encode;
+    no random bytes per order.
+    """
+
+    def __init__(self, prefix=None):
+        if prefix is None:
+            started = int(time.time()) % 36**6
+            salt = (os.getpid() * 7919 + int.from_bytes(os.urandom(4), "big")) % 36**4
+            prefix = encode_base36(started, 6) + encode_base36(salt, 4)
+        self.prefix = prefix
+        self._counter = itertools.count(1)  # next() on a count is atomic
+
+    def __call__(self):
+        return self.prefix + encode_base36(next(self._counter))
+
+
+def uuid8():
+    """The original scheme: 32 random bits per ID."""
+    return str(uuid.uuid4())[:8]
@@ -0,0 +1,308 @@
+import math
+import mmap
+import os
+import struct
+import threading
+
+from .order_store import OrderRecord, OrderStatus, Side
+
+_MAGIC = b"PBJRNL01"
+_LENGTH = struct.Struct("<I")  # body length, written last to commit a record
+
+# Record kinds
+ORDER = 1  # a new order or amendment was registered
+UPDATE = 2  # an order's OrderID/status/fills changed
+FILL = 3  # a fill applied to the ledger
+SEED = 4  # the ledger was re-seeded; replaces all earlier positions
+
+_ORDER = struct.Struct("<BddQ")  # side, qty, price, time_ns
+_UPDATE = struct.Struct("<BQdd")  # status, time_ns, cum_qty, avg_px
+_FILL = struct.Struct("<Bdd")  # side, qty, price
+_SEED = struct.Struct("<dI")  # cash (nan = unknown), position count
+# qty, avg_price, realized_pnl, last_price (nan = unknown)
+_POSITION = struct.Struct("<dddd")
+
+
+def _pack_str(value):
+    data = (value or "").encode()
+    return struct.pack("<H", len(data)) + data
+
+
+def _unpack_str(buf, pos):
+    (size,) = struct.unpack_from("<H", buf, pos)
+    pos += 2
+    return bytes(buf[pos : pos + size]).decode(), pos + size
+
+
+def _num(value):
+    # Quantities are stored as doubles; give whole numbers back as ints
+    return int(value) if value.is_integer() else value
+
+
+class OrderJournal:
+    """
+    Append-only, memory-mapped log of order and ledger events.
+
+    Each record is [u32 length][u8 kind][body]. The body is written before
+    the length, so a record a crash cut short still has length 0 and replay
+    stops in front of it. Writes only touch the mapping (no fsync); the
+    kernel persists the pages even if the process dies. The file grows by
+    doubling, and compact() rewrites it down to the live state, keeping the
+    ExecIDs already applied to the orders it carries over. needs_compaction()
+    turns true once the journal holds compact_at bytes and at least twice
+    what the last compaction left.
+    """
+
+    def __init__(self, path, initial_size=1 << 20, compact_at=64 << 20):
+        self.path = path
+        self.initial_size = max(initial_size, 4096)
+        self.compact_at = compact_at
+        self._lock = threading.RLock()
+        self._file = None
+        self._mm = None
+        self._offset = len(_MAGIC)
+        self._live_size = 0  # bytes left by the last compaction
+        # ClOrdID -> ExecIDs journaled for orders that are still open
+        self._exec_ids = {}
+        self._open()
+
+    @property
+    def size(self):
+        """Bytes of the journal in use."""
+        return self._offset
+
+    def needs_compaction(self):
+        return self._offset >= max(self.compact_at, 2 * self._live_size)
+
+    def _open(self):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self._file = open(self.path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.truncate(self.initial_size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        if not exists:
+            self._mm[: len(_MAGIC)] = _MAGIC
+        elif self._mm[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{self.path} is not an order journal")
+        self._offset = self._scan_end()
+
+    def _scan_end(self):
+        offset = len(_MAGIC)
+        for _, _, end in self._records():
+            offset = end
+        return offset
+
+    def _records(self):
+        mm = self._mm
+        offset = len(_MAGIC)
+        limit = len(mm) - _LENGTH.size
+        while offset <= limit:
+            (length,) = _LENGTH.unpack_from(mm, offset)
+            start = offset + _LENGTH.size
+            if length == 0 or start + length > len(mm):
+                return
+            yield mm[start], start + 1, start + length
+            offset = start + length
+
+    def _append(self, kind, body):
+        size = _LENGTH.size + 1 + len(body)
+        with self._lock:
+            if self._mm is None:
+                return
+            if self._offset + size + _LENGTH.size > len(self._mm):
+                self._grow(self._offset + size + _LENGTH.size)
+            start = self._offset + _LENGTH.size
+            self._mm[start] = kind
+            self._mm[start + 1 : start + 1 + len(body)] = body
+            _LENGTH.pack_into(self._mm, self._offset, 1 + len(body))
+            self._offset += size
+
+    def _grow(self, needed):
+        new_size = len(self._mm)
+        while new_size < needed:
+            new_size *= 2
+        self._mm.close()
+        self._file.truncate(new_size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+    # Writers
+    def order(self, record):
+        self._append(
+            ORDER,
+            _pack_str(record.cl_ord_id)
+            + _pack_str(record.orig_cl_ord_id)
+            + _pack_str(record.exchange)
+            + _pack_str(record.symbol)
+            + _ORDER.pack(int(record.side), record.qty, record.price, record.time_ns)
+            + _pack_str(record.ord_type)
+            + _pack_str(record.tif),
+        )
+
+    def update(self, record, exec_id=""):
+        body = (
+            _pack_str(record.cl_ord_id)
+            + _pack_str(record.order_id)
+            + _pack_str(record.replaced_by)
+            + _pack_str(exec_id)
+            + _UPDATE.pack(
+                int(record.status), record.time_ns, record.cum_qty, record.avg_px
+            )
+        )
+        with self._lock:
+            self._append(UPDATE, body)
+            self._track(record.cl_ord_id, record.status, exec_id)
+
+    def _track(self, cl_ord_id, status, exec_id):
+        # Caller holds self._lock
+        if status.is_terminal:
+            self._exec_ids.pop(cl_ord_id, None)
+        elif exec_id:
+            self._exec_ids.setdefault(cl_ord_id, []).append(exec_id)
+
+    def fill(self, full_symbol, is_buy, qty, price):
+        side = Side.BUY if is_buy else Side.SELL
+        self._append(
+            FILL, _pack_str(full_symbol) + _FILL.pack(int(side), qty, price)
+        )
+
+    def seed(self, positions, cash):
+        """positions: {full_symbol: (qty, avg_price, realized_pnl, last_price)}"""
+        self._append(SEED, self._encode_seed(positions, cash))
+
+    @staticmethod
+    def _encode_seed(positions, cash):
+        parts = [_SEED.pack(math.nan if cash is None else cash, len(positions))]
+        for full_symbol, (qty, avg, realized, last) in positions.items():
+            parts.append(_pack_str(full_symbol))
+            parts.append(
+                _POSITION.pack(
+                    qty,
+                    math.nan if avg is None else avg,
+                    realized,
+                    math.nan if last is None else last,
+                )
+            )
+        return b"".join(parts)
+
+    # Reader
+    def replay(self, ledger=None):
+        """
+        Rebuild state from the journal. SEED and FILL records are applied
+        to `ledger` in order, if given. Returns (records, exec_ids): the
+        OrderRecords by ClOrdID in the order first seen and the ExecIDs
+        already applied.
+        """
+        records = {}
+        exec_ids = []
+        with self._lock:
+            buf = self._mm
+            for kind, pos, end in self._records():
+                if kind == ORDER:
+                    cl_ord_id, pos = _unpack_str(buf, pos)
+                    orig_cl_ord_id, pos = _unpack_str(buf, pos)
+                    exchange, pos = _unpack_str(buf, pos)
+                    symbol, pos = _unpack_str(buf, pos)
+                    side, qty, price, time_ns = _ORDER.unpack_from(buf, pos)
+                    pos += _ORDER.size
+                    # Journals written before ord_type/tif were kept end here
+                    ord_type, tif = "LIMIT", "GTC"
+                    if pos < end:
+                        ord_type, pos = _unpack_str(buf, pos)
+                        tif, pos = _unpack_str(buf, pos)
+                    record = OrderRecord(
+                        cl_ord_id,
+                        exchange=exchange,
+                        symbol=symbol,
+                        side=Side(side),
+                        qty=_num(qty),
+                        price=price,
+                        time_ns=time_ns,
+                        ord_type=ord_type,
+                        tif=tif,
+                    )
+                    record.orig_cl_ord_id = orig_cl_ord_id or None
+                    records[cl_ord_id] = record
+                elif kind == UPDATE:
+                    cl_ord_id, pos = _unpack_str(buf, pos)
+                    order_id, pos = _unpack_str(buf, pos)
+                    replaced_by, pos = _unpack_str(buf, pos)
+                    exec_id, pos = _unpack_str(buf, pos)
+                    status, time_ns, cum_qty, avg_px = _UPDATE.unpack_from(buf, pos)
+                    record = records.get(cl_ord_id)
+                    if record is None:
+                        record = records[cl_ord_id] = OrderRecord(cl_ord_id)
+                    record.order_id = order_id or None
+                    record.replaced_by = replaced_by or None
+                    record.status = OrderStatus(status)
+                    record.time_ns = time_ns
+                    record.cum_qty = _num(cum_qty)
+                    record.avg_px = avg_px
+                    self._track(cl_ord_id, record.status, exec_id)
+                    if exec_id:
+                        exec_ids.append(exec_id)
+                elif kind == FILL and ledger is not None:
+                    full_symbol, pos = _unpack_str(buf, pos)
+                    side, qty, price = _FILL.unpack_from(buf, pos)
+                    ledger.on_trade(full_symbol, side == Side.BUY, _num(qty), price)
+                elif kind == SEED and ledger is not None:
+                    raw_cash, count = _SEED.unpack_from(buf, pos)
+                    pos += _SEED.size
+                    positions = {}
+                    for _ in range(count):
+                        full_symbol, pos = _unpack_str(buf, pos)
+                        qty, avg, realized, last = _POSITION.unpack_from(buf, pos)
+                        pos += _POSITION.size
+                        positions[full_symbol] = (
+                            _num(qty),
+                            None if math.isnan(avg) else avg,
+                            realized,
+                            None if math.isnan(last) else last,
+                        )
+                    ledger.restore(
+                        positions, None if math.isnan(raw_cash) else raw_cash
+                    )
+        return records, exec_ids
+
+    def compact(self, records, positions, cash):
+        """
+        Rewrite the journal as one SEED plus the given OrderRecords, then
+        keep appending to the new file. Each record is written with the
+        ExecIDs journaled for it so far, so they are still known as applied
+        after the next replay.
+        """
+        with self._lock:
+            tmp_path = self.path + ".tmp"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            compacted = OrderJournal(tmp_path, self.initial_size)
+            compacted.seed(positions, cash)
+            for record in records:
+                compacted.order(record)
+                compacted.update(record)
+                for exec_id in self._exec_ids.get(record.cl_ord_id, ()):
+                    compacted.update(record, exec_id)
+            exec_ids = compacted._exec_ids
+            compacted.close()
+            self._close()
+            os.replace(tmp_path, self.path)
+            self._open()
+            self._exec_ids = exec_ids
+            self._live_size = self._offset
+
+    def flush(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.flush()
+
+    def _close(self):
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
@@ -0,0 +1,121 @@
+import threading
+import time
+
+# Sub-bucket resolution: 2**_SUB_BITS buckets per power of two (~1.6% error)
+_SUB_BITS = 6
+_HALF = 1 << (_SUB_BITS - 1)
+_MAX_SHIFT = 40  # values up to ~2**46 ns (about 19 hours)
+_BUCKETS = (_MAX_SHIFT + 2) * _HALF
+
+
+def _bucket_index(value):
+    shift = value.bit_length() - _SUB_BITS
+    if shift <= 0:
+        return value
+    if shift > _MAX_SHIFT:
+        return _BUCKETS - 1
+    return (shift + 1) * _HALF + ((value >> shift) - _HALF)
+
+
+def _bucket_value(index):
+    """Midpoint of the values that land in bucket `index`."""
+    if index < 2 * _HALF:
+        return index
+    shift = index // _HALF - 1
+    mantissa = index % _HALF + _HALF
+    low = mantissa << shift
+    return low + (1 << shift) // 2
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of nanosecond durations. record() is a
+    bit_length, a shift and a list increment; memory is a fixed list of
+    ~1.3k ints no matter how many samples are recorded.
+    """
+
+    def __init__(self):
+        self._counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value_ns):
+        if value_ns < 0:
+            value_ns = 0
+        self._counts[_bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        if self.min is None or value_ns < self.min:
+            self.min = value_ns
+
+    def percentile(self, pct):
+        """Approximate value (ns) at or below which pct% of samples fall."""
+        if not self.count:
+            return None
+        rank = max(1, int(round(pct / 100.0 * self.count)))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    return max(self.min, min(_bucket_value(index), self.max))
+        return self.max
+
+    def reset(self):
+        self.__init__()
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        """Counts plus min/mean/max and percentiles, in microseconds."""
+        if not self.count:
+            return {"count": 0}
+        result = {
+            "count": self.count,
+            "min_us": self.min / 1e3,
+            "mean_us": self.total / self.count / 1e3,
+            "max_us": self.max / 1e3,
+        }
+        for pct in percentiles:
+            result[f"p{pct:g}_us"] = self.percentile(pct) / 1e3
+        return result
+
+
+class LatencyTracker:
+    """
+    Named histograms for the order path, fed with time.monotonic_ns()
+    deltas by OrderManager:
+
+    ack     new order sent -> ExecutionReport New
+    fill    new order sent -> each trade report
+    cancel  cancel sent -> Canceled report
+    replace replace sent -> Replaced report
+    """
+
+    NAMES = ("ack", "fill", "cancel", "replace")
+
+    def __init__(self):
+        self.histograms = {name: LatencyHistogram() for name in self.NAMES}
+        self._lock = threading.Lock()
+
+    def record(self, name, started_ns, ended_ns=None):
+        if not started_ns:
+            return
+        if ended_ns is None:
+            ended_ns = time.monotonic_ns()
+        with self._lock:
+            self.histograms[name].record(ended_ns - started_ns)
+
+    def stats(self, percentiles=(50, 90, 99, 99.9)):
+        with self._lock:
+            return {
+                name: histogram.summary(percentiles)
+                for name, histogram in self.histograms.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            for histogram in self.histograms.values():
+                histogram.reset()
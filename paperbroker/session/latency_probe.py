@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import deque
+import quickfix as fix
+import quickfix44 as fix44
+from .fix_time import parse_utc_timestamp_ns
+from .latency import LatencyHistogram
+
+# TestReqIDs the probe sends are PREFIX + monotonic send time in ns, so the
+# Heartbeat echoing one carries its own start time
+PREFIX = "PBPROBE-"
+
+
+class LatencyProbe:
+    """
+    Round-trip probe on the admin layer. While logged on, a worker thread
+    sends a TestRequest every `interval` seconds; the server must answer
+    with a Heartbeat echoing the TestReqID. The last `window` round trips
+    are kept for percentiles, and each reply also gives a clock offset
+    estimate: server SendingTime minus local wall time at the midpoint of
+    the round trip (positive when the server clock is ahead).
+
+    A probe still unanswered when the next one is due counts as lost.
+    """
+
+    def __init__(self, logger=None, interval=5.0, window=256):
+        self.logger = logger
+        self.interval = float(interval)
+        self._samples = deque(maxlen=window)  # (rtt_ns, offset_ns)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        self.session_id = None
+        self._pending_ns = None
+
+        # Metrics
+        self.sent = 0
+        self.received = 0
+        self.lost = 0
+        self._last_reply_ns = None
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._wake.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="paperbroker-probe", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        with self._lock:
+            self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def on_logon(self, session_id):
+        with self._lock:
+            self.session_id = session_id
+            self._pending_ns = None
+        self._wake.set()  # probe right away
+
+    def on_logout(self):
+        with self._lock:
+            self.session_id = None
+            self._pending_ns = None
+
+    def on_heartbeat(self, test_req_id, sending_time=None):
+        """
+        Match a Heartbeat's TestReqID against the probe. Returns False for
+        heartbeats that are not replies to this probe.
+        """
+        if not test_req_id.startswith(PREFIX):
+            return False
+        received_ns = time.monotonic_ns()
+        wall_ns = time.time_ns()
+        try:
+            sent_ns = int(test_req_id[len(PREFIX) :])
+        except ValueError:
+            return False
+        rtt = received_ns - sent_ns
+        offset = None
+        if sending_time:
+            try:
+                offset = parse_utc_timestamp_ns(sending_time) - (wall_ns - rtt // 2)
+            except ValueError:
+                pass
+        with self._lock:
+            if sent_ns == self._pending_ns:
+                self._pending_ns = None
+            self._samples.append((rtt, offset))
+            self.received += 1
+            self._last_reply_ns = received_ns
+        return True
+
+    def health(self, percentiles=(50, 90, 99)):
+        """
+        RTT percentiles over the window (µs), the last RTT, the clock offset
+        from the fastest round trip in the window (least queueing, so the
+        tightest estimate), probe counts, and seconds since the last reply.
+        """
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            samples = list(self._samples)
+            pending_ns = self._pending_ns
+            last_reply_ns = self._last_reply_ns
+            sent, received, lost = self.sent, self.received, self.lost
+
+        histogram = LatencyHistogram()
+        for rtt, _ in samples:
+            histogram.record(rtt)
+        with_offset = [s for s in samples if s[1] is not None]
+        best = min(with_offset, key=lambda s: s[0]) if with_offset else None
+        return {
+            "rtt": histogram.summary(percentiles),
+            "last_rtt_us": samples[-1][0] / 1e3 if samples else None,
+            "clock_offset_us": best[1] / 1e3 if best else None,
+            "probes_sent": sent,
+            "probes_received": received,
+            "probes_lost": lost,
+            "outstanding_us": (now_ns - pending_ns) / 1e3 if pending_ns else None,
+            "since_reply_s": (
+                (now_ns - last_reply_ns) / 1e9 if last_reply_ns else None
+            ),
+        }
+
+    def _send(self):
+        with self._lock:
+            session_id = self.session_id
+            if session_id is None:
+                return
+            if self._pending_ns is not None:
+                self.lost += 1
+            sent_ns = self._pending_ns = time.monotonic_ns()
+            self.sent += 1
+        message = fix44.TestRequest()
+        message.setField(fix.TestReqID(f"{PREFIX}{sent_ns}"))
+        try:
+            fix.Session.sendToTarget(message, session_id)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"[PROBE] Failed to send TestRequest: {e}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._running:
+                    return
+            self._send()
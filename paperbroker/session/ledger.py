@@ -0,0 +1,148 @@
+import threading
+
+
+class Position:
+    __slots__ = ("qty", "avg_price", "realized_pnl", "last_price")
+
+    def __init__(self, qty=0, avg_price=0.0, realized_pnl=0.0, last_price=None):
+        self.qty = qty
+        self.avg_price = avg_price
+        self.realized_pnl = realized_pnl
+        self.last_price = last_price
+
+    def to_dict(self, instrument):
+        return {
+            "instrument": instrument,
+            "quantity": self.qty,
+            "avgPrice": self.avg_price,
+            "realizedPnl": self.realized_pnl,
+            "lastPrice": self.last_price,
+        }
+
+
+class Ledger:
+    """
+    In-process positions and cash, kept current from trade ExecutionReports.
+
+    Seed it once from the REST portfolio/remain-balance, then every fill is
+    applied incrementally. Prices are in the instrument's quote units; the
+    per-instrument multiplier converts them to cash (e.g. a futures contract
+    size). Fees and margin are not modeled, so cash is an estimate between
+    seeds.
+
+    The REST portfolio gives cost in cash per contract, not in quote units,
+    so a seeded position's avg_price is None (unknown). It stays unknown
+    while fills add to the position, reductions book no realized P&L, and
+    it becomes known again once the position goes flat or flips.
+    """
+
+    def __init__(self, multipliers=None):
+        self.multipliers = dict(multipliers or {})
+        self.cash = None
+        self._positions = {}  # full_symbol -> Position
+        self._lock = threading.Lock()
+
+    def seed(self, portfolio=None, remain_balance=None):
+        """Reset state from AccountClient.get_portfolio/get_remain_balance."""
+        with self._lock:
+            if portfolio is not None:
+                positions = {}
+                for holding in portfolio.get("holdings", []):
+                    instrument = holding.get("instrument")
+                    qty = holding.get("quantity", 0)
+                    if not instrument or not qty:
+                        continue
+                    positions[instrument] = Position(
+                        qty=qty,
+                        avg_price=None,
+                        last_price=holding.get("currentPrice"),
+                    )
+                self._positions = positions
+            if remain_balance is not None and "remainBalance" in remain_balance:
+                self.cash = remain_balance["remainBalance"]
+
+    def snapshot(self):
+        """
+        ({full_symbol: (qty, avg_price, realized_pnl, last_price)}, cash),
+        the form restore() and OrderJournal.seed() take.
+        """
+        with self._lock:
+            positions = {
+                instrument: (
+                    position.qty,
+                    position.avg_price,
+                    position.realized_pnl,
+                    position.last_price,
+                )
+                for instrument, position in self._positions.items()
+            }
+            return positions, self.cash
+
+    def restore(self, positions, cash):
+        """Replace all state with a snapshot() result (e.g. from the journal)."""
+        with self._lock:
+            self._positions = {
+                instrument: Position(*values)
+                for instrument, values in positions.items()
+            }
+            self.cash = cash
+
+    def on_trade(self, full_symbol, is_buy, qty, price):
+        """Apply one fill. qty is always positive; is_buy gives the direction."""
+        multiplier = self.multipliers.get(full_symbol, 1)
+        signed = qty if is_buy else -qty
+        with self._lock:
+            position = self._positions.get(full_symbol)
+            if position is None:
+                position = self._positions[full_symbol] = Position()
+
+            current = position.qty
+            if current == 0:
+                position.avg_price = price
+                position.qty = signed
+            elif (current > 0) == (signed > 0):
+                # Adding: weighted average entry price
+                total = current + signed
+                if position.avg_price is not None:
+                    position.avg_price = (
+                        abs(current) * position.avg_price + qty * price
+                    ) / abs(total)
+                position.qty = total
+            else:
+                # Reducing, closing or flipping
+                closed = min(abs(current), qty)
+                direction = 1 if current > 0 else -1
+                if position.avg_price is not None:
+                    position.realized_pnl += (
+                        (price - position.avg_price) * closed * direction * multiplier
+                    )
+                position.qty = current + signed
+                if position.qty == 0:
+                    position.avg_price = 0.0
+                elif (position.qty > 0) != (current > 0):
+                    position.avg_price = price
+
+            position.last_price = price
+            if self.cash is not None:
+                self.cash -= signed * price * multiplier
+
+    def get_position(self, full_symbol):
+        with self._lock:
+            position = self._positions.get(full_symbol)
+            return (position or Position()).to_dict(full_symbol)
+
+    def get_quantity(self, full_symbol):
+        position = self._positions.get(full_symbol)
+        return position.qty if position is not None else 0
+
+    def get_last_price(self, full_symbol):
+        position = self._positions.get(full_symbol)
+        return position.last_price if position is not None else None
+
+    def get_positions(self):
+        with self._lock:
+            return {
+                instrument: position.to_dict(instrument)
+                for instrument, position in self._positions.items()
+                if position.qty
+            }
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import Future, wait
+
+
+class OrderRejected(Exception):
+    def __init__(self, cl_ord_id, reason=""):
+        super().__init__(f"Order {cl_ord_id} was rejected: {reason}")
+        self.cl_ord_id = cl_ord_id
+        self.reason = reason
+
+
+class OrderFinished(Exception):
+    """Raised when cancelling or amending an order that is already final."""
+
+    def __init__(self, cl_ord_id, status):
+        super().__init__(f"Order {cl_ord_id} is already {status}")
+        self.cl_ord_id = cl_ord_id
+        self.status = status
+
+
+class OrderHandle:
+    """
+    Tracks one order placed through OrderManager.
+
+    accepted -> OrderID once the server acks the order (OrderRejected on reject)
+    filled   -> True when fully filled, False if it ends any other way
+    done     -> final status: "Filled", "Canceled", "Rejected", "Expired"
+                or "DoneForDay"
+
+    All three are concurrent.futures.Future objects completed from the
+    execution report callback; use the async_* helpers inside asyncio code.
+    """
+
+    __slots__ = ("cl_ord_id", "accepted", "filled", "done")
+
+    TERMINAL = ("Filled", "Canceled", "Rejected", "Expired", "DoneForDay")
+    # Statuses that mean the server accepted the order
+    ACKED = ("New", "PartiallyFilled", "Filled", "Canceled", "Expired", "DoneForDay")
+
+    def __init__(self, cl_ord_id):
+        self.cl_ord_id = cl_ord_id
+        self.accepted = Future()
+        self.filled = Future()
+        self.done = Future()
+
+    def __str__(self):
+        return self.cl_ord_id
+
+    def __repr__(self):
+        return f"OrderHandle({self.cl_ord_id!r})"
+
+    def result(self, timeout=None):
+        """Block until the order is done and return its final status."""
+        return self.done.result(timeout)
+
+    def async_accepted(self):
+        return asyncio.wrap_future(self.accepted)
+
+    def async_filled(self):
+        return asyncio.wrap_future(self.filled)
+
+    def async_done(self):
+        return asyncio.wrap_future(self.done)
+
+    def __await__(self):
+        return self.async_done().__await__()
+
+    def _update(self, status, order_id=None, reason=""):
+        """Resolve futures for a new status. Returns True once the order is done."""
+        if status == "Rejected":
+            _set_exception(self.accepted, OrderRejected(self.cl_ord_id, reason))
+        elif status in self.ACKED:
+            _set_result(self.accepted, order_id)
+
+        if status not in self.TERMINAL:
+            return False
+        _set_result(self.filled, status == "Filled")
+        _set_result(self.done, status)
+        return True
+
+
+def wait_all(handles, timeout=None):
+    """Wait for many handles at once; returns (done, not_done) sets of handles."""
+    by_future = {h.done: h for h in handles}
+    finished, pending = wait(by_future, timeout=timeout)
+    return {by_future[f] for f in finished}, {by_future[f] for f in pending}
+
+
+def _set_result(future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future, exc):
+    if not future.done():
+        future.set_exception(exc)
@@ -0,0 +1,521 @@
+import shelve
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from enum import IntEnum
+
+
+class Side(IntEnum):
+    UNKNOWN = 0
+    BUY = 1
+    SELL = 2
+
+    @classmethod
+    def parse(cls, side):
+        """'BUY'/'SELL' or FIX '1'/'2' -> Side"""
+        if isinstance(side, str):
+            side = side.upper()
+        return _SIDE_LOOKUP.get(side, cls.UNKNOWN)
+
+
+_SIDE_LOOKUP = {"BUY": Side.BUY, "SELL": Side.SELL, "1": Side.BUY, "2": Side.SELL}
+
+
+class OrderStatus(IntEnum):
+    UNKNOWN = 0
+    PENDING_NEW = 1
+    NEW = 2
+    PARTIALLY_FILLED = 3
+    FILLED = 4
+    PENDING_CANCEL = 5
+    CANCELED = 6
+    REJECTED = 7
+    PENDING_REPLACE = 8
+    REPLACED = 9
+    EXPIRED = 10
+    DONE_FOR_DAY = 11
+
+    @property
+    def label(self):
+        """Name used by the public API, e.g. 'PartiallyFilled'"""
+        return _STATUS_LABELS[self]
+
+    @property
+    def is_terminal(self):
+        return self in _TERMINAL
+
+    @classmethod
+    def from_fix(cls, ord_status):
+        """FIX OrdStatus(39) value -> OrderStatus"""
+        return _FIX_ORD_STATUS.get(ord_status, cls.UNKNOWN)
+
+
+_STATUS_LABELS = {
+    OrderStatus.UNKNOWN: "Unknown",
+    OrderStatus.PENDING_NEW: "PendingNew",
+    OrderStatus.NEW: "New",
+    OrderStatus.PARTIALLY_FILLED: "PartiallyFilled",
+    OrderStatus.FILLED: "Filled",
+    OrderStatus.PENDING_CANCEL: "PendingCancel",
+    OrderStatus.CANCELED: "Canceled",
+    OrderStatus.REJECTED: "Rejected",
+    OrderStatus.PENDING_REPLACE: "PendingReplace",
+    OrderStatus.REPLACED: "Replaced",
+    OrderStatus.EXPIRED: "Expired",
+    OrderStatus.DONE_FOR_DAY: "DoneForDay",
+}
+
+_FIX_ORD_STATUS = {
+    "0": OrderStatus.NEW,
+    "1": OrderStatus.PARTIALLY_FILLED,
+    "2": OrderStatus.FILLED,
+    "4": OrderStatus.CANCELED,
+    "6": OrderStatus.PENDING_CANCEL,
+    "8": OrderStatus.REJECTED,
+    "A": OrderStatus.PENDING_NEW,
+    "E": OrderStatus.PENDING_REPLACE,
+    "5": OrderStatus.REPLACED,
+    "C": OrderStatus.EXPIRED,
+    "3": OrderStatus.DONE_FOR_DAY,
+}
+
+_TERMINAL = frozenset(
+    (
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.REJECTED,
+        OrderStatus.REPLACED,
+        OrderStatus.EXPIRED,
+        OrderStatus.DONE_FOR_DAY,
+    )
+)
+
+
+# One entry of an order's event history; qty/px are the fill's LastQty/LastPx
+OrderEvent = namedtuple(
+    "OrderEvent", ("exec_type", "status", "qty", "px", "transact_ns", "exec_id")
+)
+
+
+class OrderRecord:
+    """
+    Everything OrderManager knows about one order. Slotted to keep
+    per-order memory small; time_ns is epoch nanoseconds (UTC) of the
+    latest status change. transact_ns is the newest server TransactTime
+    applied so far (0 until the first report), which execution reports
+    are ordered against; the local send time is not comparable with it.
+
+    A cancel/replace creates a new record: orig_cl_ord_id points back to
+    the order it amends and replaced_by points forward to the amendment.
+    sent_ns/cancel_sent_ns are time.monotonic_ns() when the order (or
+    amendment) and its cancel went on the wire, for latency measurement.
+    cum_qty/avg_px are kept from trade reports as they arrive; history is a
+    bounded deque of OrderEvents, created on the first report. ord_type and
+    tif ("LIMIT"/"MARKET", "GTC"/"IOC") are what the order was sent with,
+    so an amendment can repeat them.
+    """
+
+    __slots__ = (
+        "cl_ord_id",
+        "order_id",
+        "exchange",
+        "symbol",
+        "side",
+        "qty",
+        "price",
+        "ord_type",
+        "tif",
+        "status",
+        "time_ns",
+        "transact_ns",
+        "orig_cl_ord_id",
+        "replaced_by",
+        "sent_ns",
+        "cancel_sent_ns",
+        "cum_qty",
+        "avg_px",
+        "history",
+    )
+
+    def __init__(
+        self,
+        cl_ord_id,
+        exchange="",
+        symbol="",
+        side=Side.UNKNOWN,
+        qty=0,
+        price=0,
+        status=OrderStatus.PENDING_NEW,
+        time_ns=0,
+        ord_type="LIMIT",
+        tif="GTC",
+    ):
+        self.cl_ord_id = cl_ord_id
+        self.order_id = None
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.price = price
+        self.ord_type = ord_type
+        self.tif = tif
+        self.status = status
+        self.time_ns = time_ns
+        self.transact_ns = 0
+        self.orig_cl_ord_id = None
+        self.replaced_by = None
+        self.sent_ns = 0
+        self.cancel_sent_ns = 0
+        self.cum_qty = 0
+        self.avg_px = 0.0
+        self.history = None
+
+    def apply_fill(self, qty, px):
+        total = self.cum_qty + qty
+        if total:
+            self.avg_px = (self.avg_px * self.cum_qty + px * qty) / total
+        self.cum_qty = total
+
+    @property
+    def full_symbol(self):
+        return f"{self.exchange}:{self.symbol}"
+
+    def __repr__(self):
+        return (
+            f"OrderRecord({self.cl_ord_id!r}, order_id={self.order_id!r}, "
+            f"{self.full_symbol}, {self.side.name}, qty={self.qty}, "
+            f"price={self.price}, status={self.status.label})"
+        )
+
+
+class RetentionPolicy:
+    """
+    How long finished (Filled/Canceled/Rejected) orders stay in memory.
+    Open orders are never evicted.
+
+    max_terminal: keep at most this many finished orders (oldest go first)
+    ttl: evict finished orders this many seconds after they finished
+    archive_path: if set, evicted orders are written to a shelve file there
+        so status lookups still answer for old ClOrdIDs
+    history: events kept per order (oldest are dropped)
+    exec_ids: most recent ExecIDs remembered to drop duplicate reports
+    """
+
+    def __init__(
+        self,
+        max_terminal=100_000,
+        ttl=None,
+        archive_path=None,
+        history=32,
+        exec_ids=200_000,
+    ):
+        self.max_terminal = max_terminal
+        self.ttl = ttl
+        self.archive_path = archive_path
+        self.history = history
+        self.exec_ids = exec_ids
+
+    @property
+    def enabled(self):
+        return self.max_terminal is not None or self.ttl is not None
+
+
+class OrderArchive:
+    """On-disk ClOrdID -> order fields store for evicted orders."""
+
+    def __init__(self, path):
+        self._db = shelve.open(path)
+        self._lock = threading.Lock()
+
+    def put(self, record):
+        value = (
+            record.order_id,
+            record.exchange,
+            record.symbol,
+            int(record.side),
+            record.qty,
+            record.price,
+            int(record.status),
+            record.time_ns,
+            record.orig_cl_ord_id,
+            record.replaced_by,
+            record.cum_qty,
+            record.avg_px,
+        )
+        with self._lock:
+            self._db[record.cl_ord_id] = value
+
+    def get(self, cl_ord_id):
+        with self._lock:
+            value = self._db.get(cl_ord_id)
+        if value is None:
+            return None
+        (
+            order_id,
+            exchange,
+            symbol,
+            side,
+            qty,
+            price,
+            status,
+            time_ns,
+            orig_cl_ord_id,
+            replaced_by,
+            *fills,
+        ) = value
+        record = OrderRecord(
+            cl_ord_id,
+            exchange=exchange,
+            symbol=symbol,
+            side=Side(side),
+            qty=qty,
+            price=price,
+            status=OrderStatus(status),
+            time_ns=time_ns,
+        )
+        record.order_id = order_id
+        record.orig_cl_ord_id = orig_cl_ord_id
+        record.replaced_by = replaced_by
+        if fills:
+            record.cum_qty, record.avg_px = fills
+        return record
+
+    def flush(self):
+        with self._lock:
+            self._db.sync()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ExecIdIndex:
+    """
+    The last `maxlen` ExecIDs in a set, with a FIFO to age them out, so a
+    resent ExecutionReport is recognized with one hash lookup.
+    """
+
+    def __init__(self, maxlen=200_000):
+        self.maxlen = maxlen
+        self._seen = set()
+        self._order = deque()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def add(self, exec_id):
+        """Remember exec_id; returns False if it was already seen."""
+        if exec_id in self._seen:
+            return False
+        self._seen.add(exec_id)
+        self._order.append(exec_id)
+        if len(self._order) > self.maxlen:
+            self._seen.discard(self._order.popleft())
+        return True
+
+
+def _leaves(record):
+    return max(record.qty - record.cum_qty, 0)
+
+
+class OrderStore:
+    """
+    OrderRecords indexed by ClOrdID and by OrderID, plus an index of open
+    orders by (full_symbol, side) with their total unfilled qty. Finished
+    orders are evicted according to a RetentionPolicy.
+    Not thread-safe on its own; OrderManager guards it with its lock.
+    Status changes must go through set_status() and fill changes through
+    apply_fill()/set_fills() to keep the indexes right.
+    """
+
+    def __init__(self, retention=None):
+        self.retention = retention or RetentionPolicy()
+        self._by_cl_ord_id = {}
+        self._by_order_id = {}
+        self._open = {}  # (full_symbol, Side) -> {cl_ord_id: record}
+        self._open_qty = {}  # (full_symbol, Side) -> unfilled qty of open orders
+        self._terminal = OrderedDict()  # cl_ord_id -> monotonic time finished
+        self._archive = (
+            OrderArchive(self.retention.archive_path)
+            if self.retention.archive_path
+            else None
+        )
+        self.exec_ids = ExecIdIndex(self.retention.exec_ids)
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._by_cl_ord_id)
+
+    def __contains__(self, cl_ord_id):
+        return cl_ord_id in self._by_cl_ord_id
+
+    def __iter__(self):
+        return iter(self._by_cl_ord_id.values())
+
+    def add(self, record):
+        self._by_cl_ord_id[record.cl_ord_id] = record
+        if record.order_id:
+            self._by_order_id[record.order_id] = record
+        if record.status.is_terminal:
+            self.mark_terminal(record)
+        else:
+            self._index_open(record)
+        return record
+
+    def set_status(self, record, status, time_ns=None):
+        was_open = not record.status.is_terminal
+        record.status = status
+        if time_ns is not None:
+            record.time_ns = time_ns
+        if status.is_terminal:
+            if was_open:
+                self._unindex_open(record)
+            self.mark_terminal(record)
+        elif not was_open:
+            self._index_open(record)
+
+    def open_orders(self, full_symbol=None, side=None):
+        """Open records, optionally filtered by 'EXCHANGE:SYMBOL' and/or Side."""
+        if isinstance(side, str):
+            side = Side.parse(side)
+        if full_symbol is not None and side is not None:
+            return list(self._open.get((full_symbol, side), {}).values())
+        return [
+            record
+            for (key_symbol, key_side), bucket in self._open.items()
+            if (full_symbol is None or key_symbol == full_symbol)
+            and (side is None or key_side == side)
+            for record in bucket.values()
+        ]
+
+    def open_count(self, full_symbol, side=None):
+        if isinstance(side, str):
+            side = Side.parse(side)
+        if side is not None:
+            return len(self._open.get((full_symbol, side), ()))
+        return len(self._open.get((full_symbol, Side.BUY), ())) + len(
+            self._open.get((full_symbol, Side.SELL), ())
+        )
+
+    def open_qty(self, full_symbol, side):
+        """Unfilled qty of the open orders for one instrument and side."""
+        if isinstance(side, str):
+            side = Side.parse(side)
+        return self._open_qty.get((full_symbol, side), 0)
+
+    def apply_fill(self, record, qty, px):
+        """record.apply_fill() that keeps the open qty in step."""
+        is_open = not record.status.is_terminal
+        if is_open:
+            self._unindex_open(record)
+        record.apply_fill(qty, px)
+        if is_open:
+            self._index_open(record)
+
+    def set_fills(self, record, cum_qty, avg_px):
+        """Overwrite cum_qty/avg_px, keeping the open qty in step."""
+        is_open = not record.status.is_terminal
+        if is_open:
+            self._unindex_open(record)
+        record.cum_qty = cum_qty
+        record.avg_px = avg_px
+        if is_open:
+            self._index_open(record)
+
+    def reindex(self, record, exchange, symbol, side):
+        """Fill in instrument/side learned later (e.g. from a server report)."""
+        is_open = not record.status.is_terminal
+        if is_open:
+            self._unindex_open(record)
+        record.exchange = exchange
+        record.symbol = symbol
+        record.side = side
+        if is_open:
+            self._index_open(record)
+
+    def _index_open(self, record):
+        key = (record.full_symbol, record.side)
+        bucket = self._open.get(key)
+        if bucket is None:
+            bucket = self._open[key] = {}
+        if record.cl_ord_id not in bucket:
+            self._open_qty[key] = self._open_qty.get(key, 0) + _leaves(record)
+        bucket[record.cl_ord_id] = record
+
+    def _unindex_open(self, record):
+        key = (record.full_symbol, record.side)
+        bucket = self._open.get(key)
+        if bucket is not None and bucket.pop(record.cl_ord_id, None) is not None:
+            self._open_qty[key] -= _leaves(record)
+            if not bucket:
+                del self._open[key]
+                del self._open_qty[key]
+
+    def get(self, cl_ord_id):
+        return self._by_cl_ord_id.get(cl_ord_id)
+
+    def add_event(self, record, event):
+        """Append an OrderEvent to the record's bounded history."""
+        if record.history is None:
+            record.history = deque(maxlen=self.retention.history)
+        record.history.append(event)
+
+    def lookup(self, cl_ord_id):
+        """Like get(), but falls back to the on-disk archive."""
+        record = self._by_cl_ord_id.get(cl_ord_id)
+        if record is None and self._archive is not None:
+            record = self._archive.get(cl_ord_id)
+        return record
+
+    def get_by_order_id(self, order_id):
+        return self._by_order_id.get(order_id)
+
+    def set_order_id(self, record, order_id):
+        if order_id and record.order_id != order_id:
+            if self._by_order_id.get(record.order_id) is record:
+                del self._by_order_id[record.order_id]
+            record.order_id = order_id
+            self._by_order_id[order_id] = record
+
+    def mark_terminal(self, record):
+        """Queue a finished order for eviction and evict whatever is due."""
+        if not self.retention.enabled:
+            return
+        self._terminal[record.cl_ord_id] = time.monotonic()
+        self._terminal.move_to_end(record.cl_ord_id)
+        self.evict()
+
+    def evict(self, now=None):
+        """Drop finished orders over the count limit or past their TTL."""
+        max_terminal = self.retention.max_terminal
+        ttl = self.retention.ttl
+        now = time.monotonic() if now is None else now
+        count = 0
+        while self._terminal:
+            cl_ord_id, finished_at = next(iter(self._terminal.items()))
+            over_count = (
+                max_terminal is not None and len(self._terminal) > max_terminal
+            )
+            expired = ttl is not None and now - finished_at > ttl
+            if not (over_count or expired):
+                break
+            del self._terminal[cl_ord_id]
+            self._remove(cl_ord_id)
+            count += 1
+        self.evicted += count
+        return count
+
+    def _remove(self, cl_ord_id):
+        record = self._by_cl_ord_id.get(cl_ord_id)
+        if record is None or not record.status.is_terminal:
+            return
+        del self._by_cl_ord_id[cl_ord_id]
+        # A replaced order shares its OrderID with the amendment
+        if self._by_order_id.get(record.order_id) is record:
+            del self._by_order_id[record.order_id]
+        if self._archive is not None:
+            self._archive.put(record)
+
+    def flush(self):
+        if self._archive is not None:
+            self._archive.flush()
@@ -0,0 +1,88 @@
+import threading
+import quickfix as fix
+import quickfix44 as fix44
+from . import fix_tags as tags
+from .fix_time import format_utc_timestamp
+
+
+def extract_exchange_and_symbol(full_symbol: str):
+    """
+    Converts 'HSX:MWG' -> ('HSX', 'MWG')
+    """
+    if ":" not in full_symbol:
+        raise ValueError(
+            f"Invalid symbol format: {full_symbol}, expected EXCHANGE:SYMBOL"
+        )
+    exchange, symbol = full_symbol.split(":", 1)
+    return exchange, symbol
+
+
+def ord_type_field(ord_type):
+    """OrdType (40) for "LIMIT" or "MARKET"."""
+    return fix.OrdType(
+        fix.OrdType_LIMIT if ord_type == "LIMIT" else fix.OrdType_MARKET
+    )
+
+
+def time_in_force_field(tif):
+    """TimeInForce (59) for "GTC" or "IOC"."""
+    return fix.TimeInForce(
+        fix.TimeInForce_GOOD_TILL_CANCEL
+        if tif == "GTC"
+        else fix.TimeInForce_IMMEDIATE_OR_CANCEL
+    )
+
+
+class OrderTemplate:
+    """
+    A reusable NewOrderSingle for one instrument/side/type/TIF.
+
+    The static fields are resolved once; send() only patches ClOrdID,
+    OrderQty, Price and TransactTime on a shared message before handing it
+    to QuickFIX, which serializes it synchronously. build() returns a
+    separate copy for messages that are queued rather than sent at once.
+    stamp_fields (e.g. OutboundStamper.fields) are pre-set as well.
+    """
+
+    def __init__(
+        self, full_symbol, side, ord_type="LIMIT", tif="GTC", stamp_fields=()
+    ):
+        self.full_symbol = full_symbol
+        self.exchange, self.symbol = extract_exchange_and_symbol(full_symbol)
+        self.side = side.upper()
+        self.ord_type = ord_type
+        self.tif = tif
+
+        self._static_fields = (
+            fix.Symbol(self.symbol),
+            fix.SecurityExchange(self.exchange),
+            fix.Side(fix.Side_BUY if self.side == "BUY" else fix.Side_SELL),
+            ord_type_field(ord_type),
+            time_in_force_field(tif),
+        ) + tuple(stamp_fields)
+        self._message = self._new_message()
+        self._lock = threading.Lock()
+
+    def _new_message(self):
+        order = fix44.NewOrderSingle()
+        for field in self._static_fields:
+            order.setField(field)
+        return order
+
+    def _patch(self, order, cl_ord_id, qty, price):
+        order.setField(tags.CL_ORD_ID, cl_ord_id)
+        order.setField(tags.ORDER_QTY, str(qty))
+        order.setField(tags.PRICE, str(price))
+        order.setField(tags.TRANSACT_TIME, format_utc_timestamp())
+
+    def build(self, cl_ord_id, qty, price):
+        """A standalone message for callers that send it later (e.g. queued)."""
+        order = self._new_message()
+        self._patch(order, cl_ord_id, qty, price)
+        return order
+
+    def send(self, cl_ord_id, qty, price, session_id):
+        # The message object is shared, so patch-and-send must be atomic
+        with self._lock:
+            self._patch(self._message, cl_ord_id, qty, price)
+            return fix.Session.sendToTarget(self._message, session_id)
@@ -0,0 +1,159 @@
+from .order_store import Side
+
+
+class RiskRejected(Exception):
+    """Raised synchronously when an order fails a pre-trade check."""
+
+    def __init__(self, check, message):
+        super().__init__(f"[{check}] {message}")
+        self.check = check
+
+
+class RiskLimits:
+    """
+    Pre-trade limits. Any limit left as None is not checked.
+
+    max_order_qty: largest qty for a single order
+    max_notional: largest qty * price * multiplier for a single order
+    max_open_orders: most open orders per instrument
+    max_position: largest absolute position per instrument if the order and
+        every working order on the same side fill
+    price_collar: max fractional distance from the reference price
+        (e.g. 0.05 = within 5% of the last trade)
+    per_symbol: {full_symbol: RiskLimits} overriding these for one
+        instrument; limits an override leaves as None fall back to these.
+        Resolved once, here.
+    """
+
+    _FIELDS = (
+        "max_order_qty",
+        "max_notional",
+        "max_open_orders",
+        "max_position",
+        "price_collar",
+    )
+
+    def __init__(
+        self,
+        max_order_qty=None,
+        max_notional=None,
+        max_open_orders=None,
+        max_position=None,
+        price_collar=None,
+        per_symbol=None,
+    ):
+        self.max_order_qty = max_order_qty
+        self.max_notional = max_notional
+        self.max_open_orders = max_open_orders
+        self.max_position = max_position
+        self.price_collar = price_collar
+        self.per_symbol = dict(per_symbol or {})
+        self._resolved = {
+            full_symbol: self._merge(override)
+            for full_symbol, override in self.per_symbol.items()
+        }
+
+    def _merge(self, override):
+        merged = RiskLimits()
+        for name in self._FIELDS:
+            value = getattr(override, name)
+            setattr(merged, name, getattr(self, name) if value is None else value)
+        return merged
+
+    def for_symbol(self, full_symbol):
+        return self._resolved.get(full_symbol, self)
+
+
+class RiskGate:
+    """
+    Runs the order path's pre-trade checks. Every built-in check is a dict
+    lookup plus arithmetic on counters OrderStore and Ledger already keep
+    (open-order index, position, last trade), so cost does not grow with
+    the number of orders. Extra checks can be added with add_check(); they
+    receive (full_symbol, side, qty, price) and raise RiskRejected.
+    """
+
+    def __init__(self, limits, orders, ledger):
+        self.limits = limits
+        self.orders = orders
+        self.ledger = ledger
+        self.reference_prices = {}  # full_symbol -> price, e.g. from market data
+        self._extra_checks = []
+
+    def add_check(self, check):
+        self._extra_checks.append(check)
+
+    def set_reference_price(self, full_symbol, price):
+        self.reference_prices[full_symbol] = price
+
+    def check(
+        self,
+        full_symbol,
+        side,
+        qty,
+        price,
+        pending_open=0,
+        new_order=True,
+        pending_qty=0,
+        replaced_qty=0,
+    ):
+        """
+        Raise RiskRejected if the order breaks a limit. pending_open counts
+        orders for the same instrument earlier in the same batch and
+        pending_qty their qty on the same side; new_order is False for
+        amendments, which do not add an open order; qty is then the new
+        total qty and replaced_qty the amended order's current qty.
+        """
+        limits = self.limits.for_symbol(full_symbol)
+
+        if limits.max_order_qty is not None and qty > limits.max_order_qty:
+            raise RiskRejected(
+                "max_order_qty", f"qty {qty} > {limits.max_order_qty}"
+            )
+
+        if limits.max_notional is not None:
+            notional = qty * price * self.ledger.multipliers.get(full_symbol, 1)
+            if notional > limits.max_notional:
+                raise RiskRejected(
+                    "max_notional", f"notional {notional} > {limits.max_notional}"
+                )
+
+        if new_order and limits.max_open_orders is not None:
+            open_orders = self.orders.open_count(full_symbol) + pending_open
+            if open_orders >= limits.max_open_orders:
+                raise RiskRejected(
+                    "max_open_orders",
+                    f"{open_orders} open orders on {full_symbol}",
+                )
+
+        if limits.max_position is not None:
+            # Working orders count as if filled, so a runaway loop of
+            # orders is stopped before the fills arrive
+            position = self.ledger.get_quantity(full_symbol)
+            working = (
+                self.orders.open_qty(full_symbol, side) + pending_qty - replaced_qty
+            )
+            exposure = working + qty
+            projected = position + (exposure if side == Side.BUY else -exposure)
+            if abs(projected) > limits.max_position and abs(projected) > abs(
+                position
+            ):
+                raise RiskRejected(
+                    "max_position",
+                    f"position would be {projected} (limit {limits.max_position})",
+                )
+
+        if limits.price_collar is not None and price:
+            reference = self.reference_prices.get(full_symbol)
+            if reference is None:
+                reference = self.ledger.get_last_price(full_symbol)
+            if reference:
+                distance = abs(price - reference) / reference
+                if distance > limits.price_collar:
+                    raise RiskRejected(
+                        "price_collar",
+                        f"price {price} is {distance:.2%} from reference {reference}",
+                    )
+
+        for extra in self._extra_checks:
+            extra(full_symbol, side, qty, price)
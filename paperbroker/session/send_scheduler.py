@@ -0,0 +1,183 @@
+import heapq
+import itertools
+import threading
+import time
+import quickfix as fix
+
+PRIORITY_CANCEL = 0
+PRIORITY_REPLACE = 1
+PRIORITY_NEW = 2
+PRIORITY_STATUS = 3
+
+
+class _Pending:
+    __slots__ = (
+        "message",
+        "session_id",
+        "priority",
+        "cl_ord_id",
+        "queued_ns",
+        "dropped",
+    )
+
+    def __init__(self, message, session_id, priority, cl_ord_id):
+        self.message = message
+        self.session_id = session_id
+        self.priority = priority
+        self.cl_ord_id = cl_ord_id
+        self.queued_ns = time.monotonic_ns()
+        self.dropped = False
+
+
+class SendScheduler:
+    """
+    Rate-limited, prioritized sender sitting between OrderManager and
+    fix.Session.sendToTarget.
+
+    A token bucket (rate messages/second, up to burst at once) paces the
+    wire. Waiting messages leave in priority order, cancels before
+    replaces before new orders before status requests, FIFO within a
+    priority. A new order that
+    is still queued when its cancel arrives is dropped together with the
+    cancel (see drop_new), so neither reaches the server.
+
+    on_sent, if set, is called as on_sent(cl_ord_id, priority, monotonic_ns)
+    on the worker thread just before each message goes on the wire.
+    """
+
+    def __init__(self, rate=50.0, burst=10, logger=None, on_sent=None):
+        # With burst < 1 the bucket never holds a whole token to send with
+        if not rate > 0:
+            raise ValueError(f"rate must be positive, not {rate!r}")
+        if not burst >= 1:
+            raise ValueError(f"burst must be at least 1, not {burst!r}")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.logger = logger
+        self.on_sent = on_sent
+
+        self._heap = []  # (priority, seq, _Pending)
+        self._seq = itertools.count()
+        self._queued_new = {}  # cl_ord_id -> _Pending for not-yet-sent new orders
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._thread = None
+        self._running = False
+
+        # Metrics
+        self.sent = 0
+        self.coalesced = 0
+        self._wait_total_ns = 0
+        self._wait_max_ns = 0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="paperbroker-send", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, drain=True, timeout=5.0):
+        """Stop the worker; by default send what is already queued first."""
+        with self._cond:
+            if drain:
+                deadline = time.monotonic() + timeout
+                while self._heap and time.monotonic() < deadline:
+                    self._cond.wait(0.05)
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, message, session_id, priority, cl_ord_id=None):
+        pending = _Pending(message, session_id, priority, cl_ord_id)
+        with self._cond:
+            if priority == PRIORITY_NEW and cl_ord_id is not None:
+                self._queued_new[cl_ord_id] = pending
+            heapq.heappush(self._heap, (priority, next(self._seq), pending))
+            self._cond.notify()
+        return True
+
+    def drop_new(self, cl_ord_id):
+        """
+        Withdraw a queued new order before it is sent. Returns True if it
+        was still queued, in which case the caller must not send a cancel.
+        """
+        with self._cond:
+            pending = self._queued_new.pop(cl_ord_id, None)
+            if pending is None:
+                return False
+            pending.dropped = True
+            self.coalesced += 1
+            return True
+
+    def metrics(self):
+        with self._cond:
+            depth = sum(1 for _, _, p in self._heap if not p.dropped)
+            sent = self.sent
+            return {
+                "depth": depth,
+                "sent": sent,
+                "coalesced": self.coalesced,
+                "avg_wait_ms": (self._wait_total_ns / sent / 1e6) if sent else 0.0,
+                "max_wait_ms": self._wait_max_ns / 1e6,
+                "tokens": self._tokens,
+            }
+
+    def _take_token(self):
+        # Caller holds self._cond. Returns seconds until a token is available.
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                delay = self._take_token()
+                if delay:
+                    # Sleep with the lock released so submits (and cancels
+                    # that should jump the queue) keep flowing
+                    self._cond.wait(delay)
+                    continue
+                _, _, pending = heapq.heappop(self._heap)
+                if pending.dropped:
+                    self._tokens += 1.0  # nothing was sent
+                    continue
+                if pending.priority == PRIORITY_NEW:
+                    if self._queued_new.get(pending.cl_ord_id) is pending:
+                        del self._queued_new[pending.cl_ord_id]
+
+            now_ns = time.monotonic_ns()
+            waited = now_ns - pending.queued_ns
+            if self.on_sent is not None and pending.cl_ord_id is not None:
+                self.on_sent(pending.cl_ord_id, pending.priority, now_ns)
+            try:
+                ok = fix.Session.sendToTarget(pending.message, pending.session_id)
+            except Exception as e:
+                ok = False
+                if self.logger:
+                    self.logger.error(f"[SEND] sendToTarget raised: {e}")
+            if not ok and self.logger:
+                self.logger.error(f"[SEND] Failed to send {pending.cl_ord_id}")
+
+            with self._cond:
+                self.sent += 1
+                self._wait_total_ns += waited
+                if waited > self._wait_max_ns:
+                    self._wait_max_ns = waited
+                self._cond.notify_all()
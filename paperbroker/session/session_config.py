@@ -0,0 +1,228 @@
+import inspect
+import quickfix as fix
+
+STORES = ("file", "memory", "null")
+MESSAGE_LOGS = ("file", "screen", "null")
+
+
+def read_cfg(cfg_path):
+    """
+    Parse a QuickFIX settings file into (defaults, [session, ...]) dicts.
+    Keys keep their case; later duplicates in a section win.
+    """
+    defaults = {}
+    sessions = []
+    section = None
+    with open(cfg_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                name = line[1:-1].strip().upper()
+                if name == "DEFAULT":
+                    section = defaults
+                else:
+                    section = {}
+                    sessions.append(section)
+                continue
+            if section is not None and "=" in line:
+                key, value = line.split("=", 1)
+                section[key.strip()] = value.strip()
+    return defaults, sessions
+
+
+def to_dictionary(values):
+    dictionary = fix.Dictionary()
+    for key, value in values.items():
+        if isinstance(value, bool):
+            value = "Y" if value else "N"
+        dictionary.setString(key, str(value))
+    return dictionary
+
+
+class SessionConfig:
+    """
+    One initiator session configured in code instead of a .cfg file.
+
+    store: where QuickFIX keeps sequence numbers and sent messages for
+        resends; "file" (FileStorePath), "memory" or "null" (nothing kept,
+        fine with ResetOnLogon=Y)
+    message_log: "file" (FileLogPath), "screen" or "null" (no message log)
+    trim_dictionary: load a copy of data_dictionary cut down to the
+        messages this client uses (generated next to it as *-min.xml)
+    extra: any other QuickFIX setting, e.g. {"ValidateFieldsOutOfOrder": "N"}
+    """
+
+    def __init__(
+        self,
+        sender_comp_id,
+        target_comp_id="SERVER",
+        host="127.0.0.1",
+        port=5001,
+        begin_string="FIX.4.4",
+        heartbeat=30,
+        data_dictionary="fix/FIX44.xml",
+        trim_dictionary=False,
+        reset_on_logon=True,
+        start_time="00:00:00",
+        end_time="23:59:59",
+        reconnect_interval=30,
+        store="memory",
+        store_path="logs/client_fix_messages/",
+        message_log="null",
+        log_path="logs/",
+        extra=None,
+    ):
+        if store not in STORES:
+            raise ValueError(f"store must be one of {STORES}, not {store!r}")
+        if message_log not in MESSAGE_LOGS:
+            raise ValueError(
+                f"message_log must be one of {MESSAGE_LOGS}, not {message_log!r}"
+            )
+        self.sender_comp_id = sender_comp_id
+        self.target_comp_id = target_comp_id
+        self.host = host
+        self.port = port
+        self.begin_string = begin_string
+        self.heartbeat = heartbeat
+        self.data_dictionary = data_dictionary
+        self.trim_dictionary = trim_dictionary
+        self.reset_on_logon = reset_on_logon
+        self.start_time = start_time
+        self.end_time = end_time
+        self.reconnect_interval = reconnect_interval
+        self.store = store
+        self.store_path = store_path
+        self.message_log = message_log
+        self.log_path = log_path
+        self.extra = dict(extra or {})
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build from keyword values; unknown keys go to `extra`."""
+        values = dict(values)
+        extra = values.pop("extra", {})
+        known = {key: values.pop(key) for key in list(values) if key in _FIELDS}
+        return cls(extra={**values, **extra}, **known)
+
+    @property
+    def session_id(self):
+        return fix.SessionID(
+            self.begin_string, self.sender_comp_id, self.target_comp_id
+        )
+
+    def defaults(self):
+        """The [DEFAULT] section as a dict."""
+        values = {
+            "ConnectionType": "initiator",
+            "SocketConnectHost": self.host,
+            "SocketConnectPort": self.port,
+            "HeartBtInt": self.heartbeat,
+            "StartTime": self.start_time,
+            "EndTime": self.end_time,
+            "ReconnectInterval": self.reconnect_interval,
+            # Only read by the file store / file log, but always set so a
+            # store or message_log override still finds its directory
+            "FileStorePath": self.store_path,
+            "FileLogPath": self.log_path,
+        }
+        return values
+
+    def session(self):
+        """The [SESSION] section as a dict."""
+        values = {
+            "BeginString": self.begin_string,
+            "SenderCompID": self.sender_comp_id,
+            "TargetCompID": self.target_comp_id,
+            "ResetOnLogon": self.reset_on_logon,
+            "ResetOnLogout": self.reset_on_logon,
+            "ResetOnDisconnect": self.reset_on_logon,
+            "IgnoreSeqNumTooLow": True,
+            "ValidateFieldsOutOfOrder": False,
+        }
+        if self.data_dictionary and self.trim_dictionary:
+            # Imported here so `python -m ...data_dictionary` runs cleanly
+            from .data_dictionary import ensure_trimmed
+
+            values["DataDictionary"] = ensure_trimmed(self.data_dictionary)
+        elif self.data_dictionary:
+            values["DataDictionary"] = self.data_dictionary
+        else:
+            values["UseDataDictionary"] = False
+        values.update(self.extra)
+        return values
+
+    def to_settings(self):
+        settings = fix.SessionSettings()
+        settings.set(to_dictionary(self.defaults()))
+        session = self.session()
+        settings.set(
+            fix.SessionID(
+                session.pop("BeginString"),
+                session.pop("SenderCompID"),
+                session.pop("TargetCompID"),
+            ),
+            to_dictionary(session),
+        )
+        return settings
+
+
+_FIELDS = frozenset(inspect.signature(SessionConfig).parameters) - {"extra"}
+
+
+def load_settings(config, store=None, message_log=None):
+    """
+    (fix.SessionSettings, store, message_log) from a .cfg path, a dict or a
+    SessionConfig. A .cfg file keeps the historical file store and no
+    message log unless `store` / `message_log` say otherwise.
+    """
+    if isinstance(config, dict):
+        config = SessionConfig.from_dict(config)
+    if isinstance(config, SessionConfig):
+        return (
+            config.to_settings(),
+            store or config.store,
+            message_log or config.message_log,
+        )
+    return fix.SessionSettings(config), store or "file", message_log or "null"
+
+
+def reconnect_interval(config):
+    """QuickFIX ReconnectInterval (seconds) for a .cfg path, dict or SessionConfig."""
+    if isinstance(config, dict):
+        config = SessionConfig.from_dict(config)
+    if isinstance(config, SessionConfig):
+        return float(config.reconnect_interval)
+    defaults, sessions = read_cfg(config)
+    values = dict(defaults)
+    if sessions:
+        values.update(sessions[0])
+    return float(values.get("ReconnectInterval", 30))
+
+
+def store_factory(store, settings):
+    """fix.*StoreFactory for "file", "memory" or "null"."""
+    if store == "file":
+        return fix.FileStoreFactory(settings)
+    if store == "null":
+        # NullStoreFactory only exists in newer QuickFIX builds
+        null_factory = getattr(fix, "NullStoreFactory", None)
+        if null_factory is not None:
+            return null_factory()
+    return fix.MemoryStoreFactory()
+
+
+def log_factory(message_log, settings):
+    """fix.*LogFactory for "file" or "screen"; None for no message log."""
+    if message_log == "file":
+        return fix.FileLogFactory(settings)
+    if message_log == "screen":
+        return fix.ScreenLogFactory(settings)
+    return None
+
+
+def socket_initiator(application, store, settings, log=None):
+    if log is None:
+        return fix.SocketInitiator(application, store, settings)
+    return fix.SocketInitiator(application, store, settings, log)
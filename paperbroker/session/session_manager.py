@@ -1,35 +1,88 @@
-import quickfix as fix
+from typing import Optional, Union
 from paperbroker.logger import get_logger
 from .app import FIXApp
+from .order_store import RetentionPolicy
+from .session_config import (
+    SessionConfig,
+    load_settings,
+    log_factory,
+    reconnect_interval,
+    socket_initiator,
+    store_factory,
+)
+from .supervisor import SessionSupervisor
 
 
 class FIXSessionManager:
     def __init__(
         self,
-        cfg_path: str,
+        cfg_path: Union[str, dict, SessionConfig],
         account: str,
         username: str,
         password: str,
         log_dir: str = "logs",
         console: bool = False,
+        retention: Optional[RetentionPolicy] = None,
+        auto_reconnect: bool = True,
+        store: Optional[str] = None,
+        message_log: Optional[str] = None,
+        async_logging: bool = False,
+        event_log: Optional[str] = None,
     ):
-        self.logger = get_logger(log_dir, console)
+        self.logger = get_logger(log_dir, console, async_logging, event_log)
 
-        self.settings = fix.SessionSettings(cfg_path)
-        self.store_factory = fix.FileStoreFactory(self.settings)
+        # cfg_path may also be a dict or SessionConfig (no file on disk);
+        # store / message_log pick the QuickFIX backends (see session_config)
+        self.settings, self.store, self.message_log = load_settings(
+            cfg_path, store, message_log
+        )
+        self.store_factory = store_factory(self.store, self.settings)
+        self.log_factory = log_factory(self.message_log, self.settings)
 
         self.app = FIXApp(
-            account=account, username=username, password=password, logger=self.logger
+            account=account,
+            username=username,
+            password=password,
+            logger=self.logger,
+            retention=retention,
+        )
+
+        self.initiator = socket_initiator(
+            self.app, self.store_factory, self.settings, self.log_factory
         )
 
-        self.initiator = fix.SocketInitiator(
-            self.app, self.store_factory, self.settings
+        # Logon/logout notifications and restart-on-outage
+        self.auto_reconnect = auto_reconnect
+        # The first restart waits two ReconnectIntervals after a logout, so
+        # QuickFIX always gets its own reconnect attempt first
+        backoff_initial = 2 * reconnect_interval(cfg_path)
+        self.supervisor = SessionSupervisor(
+            restart=self._restart_initiator,
+            logger=self.logger,
+            events=self.app.events,
+            backoff_initial=backoff_initial,
+            backoff_max=max(60.0, 4 * backoff_initial),
         )
+        self.app.supervisor = self.supervisor
 
     def start(self):
         self.logger.info("Starting FIX session...")
         self.initiator.start()
+        if self.auto_reconnect:
+            self.supervisor.start()
 
     def stop(self):
         self.logger.info("Stopping FIX session...")
+        self.supervisor.stop()
         self.initiator.stop()
+
+    def wait_logon(self, timeout=None):
+        return self.supervisor.wait_logon(timeout)
+
+    def _restart_initiator(self):
+        # Stop/start drops any half-open socket the initiator is stuck on.
+        # Reuse the same initiator: a second one for the same SessionIDs is
+        # not registered by QuickFIX, and destroying the old one would then
+        # unregister the sessions (and share the file store's files)
+        self.initiator.stop()
+        self.initiator.start()
@@ -0,0 +1,206 @@
+import threading
+import quickfix as fix
+from typing import Optional, Union
+from paperbroker.logger import get_logger
+from .app import FIXApp
+from .order_store import RetentionPolicy
+from .session_config import (
+    SessionConfig,
+    log_factory,
+    read_cfg,
+    socket_initiator,
+    store_factory,
+    to_dictionary,
+)
+from .supervisor import SessionSupervisor
+
+
+class SessionRouter(fix.Application):
+    """
+    The one fix.Application registered with a pooled SocketInitiator.
+    Every callback is forwarded to the FIXApp of the account whose
+    SessionID it carries.
+    """
+
+    def __init__(self, logger):
+        super().__init__()
+        self.logger = logger
+        self.apps = {}  # str(SessionID) -> FIXApp
+
+    def _app(self, sessionID):
+        app = self.apps.get(str(sessionID))
+        if app is None:
+            self.logger.warning(f"[POOL] No account for session {sessionID}")
+        return app
+
+    def onCreate(self, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.onCreate(sessionID)
+
+    def onLogon(self, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.onLogon(sessionID)
+
+    def onLogout(self, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.onLogout(sessionID)
+
+    def toAdmin(self, message, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.toAdmin(message, sessionID)
+
+    def fromAdmin(self, message, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.fromAdmin(message, sessionID)
+
+    def toApp(self, message, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.toApp(message, sessionID)
+
+    def fromApp(self, message, sessionID):
+        app = self._app(sessionID)
+        if app is not None:
+            app.fromApp(message, sessionID)
+
+
+class PooledSession:
+    """
+    One account's view of a FIXSessionPool, with the same surface as
+    FIXSessionManager (app, logger, supervisor, start/stop, wait_logon) so
+    PaperBrokerClient works on top of it unchanged.
+    """
+
+    def __init__(self, pool, session_id, app, supervisor):
+        self.pool = pool
+        self.session_id = session_id
+        self.app = app
+        self.logger = pool.logger
+        self.supervisor = supervisor
+
+    def start(self):
+        self.pool.start()
+        session = fix.Session.lookupSession(self.session_id)
+        if session is not None and not session.isEnabled():
+            session.logon()
+
+    def stop(self):
+        """Log this account out; the shared initiator keeps running."""
+        session = fix.Session.lookupSession(self.session_id)
+        if session is not None:
+            session.logout()
+
+    def wait_logon(self, timeout=None):
+        return self.supervisor.wait_logon(timeout)
+
+
+class FIXSessionPool:
+    """
+    Many accounts over one SessionSettings, message store and
+    SocketInitiator. cfg_path (a .cfg path, dict or SessionConfig) supplies
+    the [DEFAULT] section and, from its first [SESSION], a template for
+    every account's session; each account only needs its own SenderCompID.
+    QuickFIX reconnects each session on its own, so pooled sessions have no
+    restart supervisor.
+    """
+
+    def __init__(
+        self,
+        cfg_path: Union[str, dict, SessionConfig],
+        log_dir: str = "logs",
+        console: bool = False,
+        store: Optional[str] = None,
+        message_log: Optional[str] = None,
+        async_logging: bool = False,
+        event_log: Optional[str] = None,
+    ):
+        self.logger = get_logger(log_dir, console, async_logging, event_log)
+        if isinstance(cfg_path, dict):
+            cfg_path = SessionConfig.from_dict(cfg_path)
+        if isinstance(cfg_path, SessionConfig):
+            self.defaults, sessions = cfg_path.defaults(), [cfg_path.session()]
+            self.store = store or cfg_path.store
+            self.message_log = message_log or cfg_path.message_log
+        else:
+            self.defaults, sessions = read_cfg(cfg_path)
+            self.store, self.message_log = store or "file", message_log or "null"
+        self.template = dict(sessions[0]) if sessions else {}
+        self.template.pop("SenderCompID", None)
+        self.settings = fix.SessionSettings()
+        self.settings.set(to_dictionary(self.defaults))
+        self.router = SessionRouter(self.logger)
+        self.sessions = {}  # account -> PooledSession
+        self.initiator = None
+        self._lock = threading.Lock()
+
+    def add_account(
+        self,
+        account: str,
+        username: str,
+        password: str,
+        sender_comp_id: str,
+        target_comp_id: Optional[str] = None,
+        retention: Optional[RetentionPolicy] = None,
+    ):
+        """Register an account's session. Must be called before start()."""
+        if self.initiator is not None:
+            raise RuntimeError("Accounts must be added before the pool starts")
+        settings = dict(self.template)
+        begin_string = settings.pop("BeginString", None) or self.defaults.get(
+            "BeginString", "FIX.4.4"
+        )
+        template_target = settings.pop("TargetCompID", None)
+        target_comp_id = (
+            target_comp_id or template_target or self.defaults.get("TargetCompID")
+        )
+        if not target_comp_id:
+            raise ValueError("No TargetCompID in the config or for the account")
+        session_id = fix.SessionID(begin_string, sender_comp_id, target_comp_id)
+        self.settings.set(session_id, to_dictionary(settings))
+
+        app = FIXApp(
+            account=account,
+            username=username,
+            password=password,
+            logger=self.logger,
+            retention=retention,
+        )
+        supervisor = SessionSupervisor(
+            restart=None, logger=self.logger, events=app.events
+        )
+        app.supervisor = supervisor
+        self.router.apps[str(session_id)] = app
+        session = self.sessions[account] = PooledSession(
+            self, session_id, app, supervisor
+        )
+        return session
+
+    def start(self):
+        """Create and start the shared initiator (once)."""
+        with self._lock:
+            if self.initiator is not None:
+                return
+            self.logger.info(
+                f"Starting FIX session pool with {len(self.sessions)} accounts..."
+            )
+            self.store_factory = store_factory(self.store, self.settings)
+            self.initiator = socket_initiator(
+                self.router,
+                self.store_factory,
+                self.settings,
+                log_factory(self.message_log, self.settings),
+            )
+            self.initiator.start()
+
+    def stop(self):
+        with self._lock:
+            if self.initiator is None:
+                return
+            self.logger.info("Stopping FIX session pool...")
+            self.initiator.stop()
+            self.initiator = None
@@ -0,0 +1,21 @@
+import quickfix as fix
+from . import fix_tags as tags
+
+
+class OutboundStamper:
+    """
+    The Username/Account fields every outbound message carries, built once
+    per session. stamp() skips messages that already have them, which is
+    the case for everything built from an OrderTemplate (see `fields`).
+    """
+
+    def __init__(self, account, username):
+        self.account = account
+        self.username = username
+        self.fields = (fix.Username(username), fix.Account(account))
+
+    def stamp(self, message):
+        if message.isSetField(tags.USERNAME):
+            return
+        for field in self.fields:
+            message.setField(field)
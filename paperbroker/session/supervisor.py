@@ -0,0 +1,154 @@
+import asyncio
+import random
+import threading
+import time
+
+from .event_bus import SESSION_STATE
+
+
+class SessionSupervisor:
+    """
+    Tracks logon state for one FIX session and restarts the initiator when
+    the session stays down.
+
+    FIXApp calls on_logon/on_logout from the QuickFIX thread; wait_logon()
+    blocks on a Condition until logon instead of polling. Once a logged-on
+    session drops, a monitor thread waits for it to come back for a
+    jittered, exponentially growing delay (backoff_initial to 1.5x that,
+    doubling up to backoff_max) and then calls `restart`. The first logon
+    is left entirely to QuickFIX, and the delay resets on every logon, so
+    backoff_initial should leave room for QuickFIX's own ReconnectInterval.
+    """
+
+    def __init__(
+        self,
+        restart,
+        logger=None,
+        events=None,
+        backoff_initial=5.0,
+        backoff_max=60.0,
+    ):
+        self.restart = restart
+        self.logger = logger
+        self.events = events
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self._cond = threading.Condition()
+        self._logged_on = False
+        # Set by the first logout after a logon; restarts only happen then
+        self._armed = False
+        self._running = False
+        self._thread = None
+
+        self.logons = 0
+        self.logouts = 0
+        self.reconnects = 0
+        self._logon_at = None  # monotonic time of the current logon
+        self._down_since = time.monotonic()
+
+    @property
+    def logged_on(self):
+        return self._logged_on
+
+    def on_logon(self):
+        with self._cond:
+            self._logged_on = True
+            self._logon_at = time.monotonic()
+            self.logons += 1
+            self._cond.notify_all()
+
+    def on_logout(self):
+        with self._cond:
+            if self._logged_on:
+                self.logouts += 1
+                self._down_since = time.monotonic()
+                self._armed = True
+            self._logged_on = False
+            self._logon_at = None
+            self._cond.notify_all()
+
+    def wait_logon(self, timeout=None):
+        """Block until the session is logged on. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._logged_on, timeout)
+
+    async def wait_logon_async(self, timeout=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait_logon, timeout)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._cond:
+            return {
+                "logged_on": self._logged_on,
+                "uptime_s": now - self._logon_at if self._logged_on else 0.0,
+                "downtime_s": 0.0 if self._logged_on else now - self._down_since,
+                "logons": self.logons,
+                "logouts": self.logouts,
+                "reconnects": self.reconnects,
+            }
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            if not self._logged_on:
+                self._down_since = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="paperbroker-supervisor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        delay = self.backoff_initial
+        logons = 0
+        while True:
+            with self._cond:
+                while self._running and (self._logged_on or not self._armed):
+                    self._cond.wait()
+                if not self._running:
+                    return
+                if self.logons != logons:
+                    # Logged on since the last outage: start over
+                    logons = self.logons
+                    delay = self.backoff_initial
+                # Down: give QuickFIX's own reconnect a jittered grace period
+                # of at least `delay`
+                deadline = time.monotonic() + delay * random.uniform(1.0, 1.5)
+                while self._running and not self._logged_on:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._running:
+                    return
+                if self._logged_on:
+                    continue
+                self.reconnects += 1
+                attempt = self.reconnects
+
+            if self.logger:
+                self.logger.warning(
+                    f"[SUPERVISOR] Session down, restarting initiator "
+                    f"(attempt {attempt})"
+                )
+            if self.events is not None:
+                self.events.publish(
+                    SESSION_STATE, {"state": "reconnecting", "attempt": attempt}
+                )
+            try:
+                self.restart()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"[SUPERVISOR] Restart failed: {e}")
+            delay = min(delay * 2, self.backoff_max)
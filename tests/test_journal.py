@@ -0,0 +1,160 @@
+import pytest
+
+from paperbroker.session.journal import ORDER, OrderJournal, _ORDER, _pack_str
+from paperbroker.session.ledger import Ledger
+from paperbroker.session.order_store import OrderRecord, OrderStatus, Side
+
+
+def make_record(cl_ord_id, side=Side.BUY, qty=10, price=50.0, **kwargs):
+    return OrderRecord(
+        cl_ord_id,
+        exchange="HSX",
+        symbol="MWG",
+        side=side,
+        qty=qty,
+        price=price,
+        time_ns=1,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "orders.journal")
+
+
+def test_replay_restores_orders_exec_ids_and_ledger(path):
+    journal = OrderJournal(path, initial_size=4096)
+    journal.seed({"HSX:MWG": (100, 48.0, 0.0, None)}, 1_000.0)
+    record = make_record("A", ord_type="MARKET", tif="IOC")
+    journal.order(record)
+    record.order_id = "O1"
+    record.status = OrderStatus.PARTIALLY_FILLED
+    record.cum_qty, record.avg_px = 4, 50.0
+    journal.update(record, exec_id="E1")
+    journal.fill("HSX:MWG", True, 4, 50.0)
+    journal.close()
+
+    ledger = Ledger()
+    records, exec_ids = OrderJournal(path).replay(ledger)
+
+    restored = records["A"]
+    assert restored.order_id == "O1"
+    assert restored.status == OrderStatus.PARTIALLY_FILLED
+    assert (restored.cum_qty, restored.avg_px) == (4, 50.0)
+    assert (restored.ord_type, restored.tif) == ("MARKET", "IOC")
+    assert restored.full_symbol == "HSX:MWG"
+    assert exec_ids == ["E1"]
+    assert ledger.get_quantity("HSX:MWG") == 104
+    assert ledger.cash == 1_000.0 - 4 * 50.0
+
+
+def test_file_grows_past_initial_size(path):
+    journal = OrderJournal(path, initial_size=4096)
+    for i in range(500):
+        journal.order(make_record(f"ID{i}"))
+    journal.close()
+
+    records, _ = OrderJournal(path).replay()
+    assert len(records) == 500
+
+
+def test_torn_record_is_ignored_and_overwritten(path):
+    journal = OrderJournal(path, initial_size=4096)
+    journal.order(make_record("A"))
+    torn_at = journal.size
+    journal.order(make_record("B"))
+    # A crash before the length was written leaves it zero
+    journal._mm[torn_at : torn_at + 4] = b"\0\0\0\0"
+    journal.close()
+
+    journal = OrderJournal(path)
+    records, _ = journal.replay()
+    assert list(records) == ["A"]
+    assert journal.size == torn_at
+
+    journal.order(make_record("C"))
+    journal.close()
+    records, _ = OrderJournal(path).replay()
+    assert list(records) == ["A", "C"]
+
+
+def test_old_order_records_replay_as_limit_gtc(path):
+    journal = OrderJournal(path, initial_size=4096)
+    # ORDER body as written before ord_type/tif were journaled
+    journal._append(
+        ORDER,
+        _pack_str("A")
+        + _pack_str(None)
+        + _pack_str("HSX")
+        + _pack_str("MWG")
+        + _ORDER.pack(int(Side.SELL), 5, 51.0, 1),
+    )
+    journal.close()
+
+    records, _ = OrderJournal(path).replay()
+    assert (records["A"].ord_type, records["A"].tif) == ("LIMIT", "GTC")
+    assert records["A"].side == Side.SELL
+
+
+def test_compact_keeps_open_orders_and_their_exec_ids(path):
+    journal = OrderJournal(path, initial_size=4096)
+    live = make_record("LIVE")
+    done = make_record("DONE")
+    for record in (live, done):
+        journal.order(record)
+        record.status = OrderStatus.NEW
+        journal.update(record, exec_id=f"N-{record.cl_ord_id}")
+    live.status = OrderStatus.PARTIALLY_FILLED
+    live.cum_qty, live.avg_px = 2, 50.0
+    journal.update(live, exec_id="F-LIVE")
+    done.status = OrderStatus.FILLED
+    journal.update(done, exec_id="F-DONE")
+    journal.close()
+
+    # Two restarts, each replaying and compacting to the open orders
+    for _ in range(2):
+        journal = OrderJournal(path, initial_size=4096)
+        ledger = Ledger()
+        records, exec_ids = journal.replay(ledger)
+        open_records = [r for r in records.values() if not r.status.is_terminal]
+        journal.compact(open_records, *ledger.snapshot())
+        journal.close()
+
+    records, exec_ids = OrderJournal(path).replay()
+    assert list(records) == ["LIVE"]
+    assert records["LIVE"].cum_qty == 2
+    assert set(exec_ids) == {"N-LIVE", "F-LIVE"}
+
+
+def test_compact_replaces_ledger_history_with_a_seed(path):
+    journal = OrderJournal(path, initial_size=4096)
+    ledger = Ledger()
+    for _ in range(50):
+        ledger.on_trade("HSX:MWG", True, 1, 50.0)
+        journal.fill("HSX:MWG", True, 1, 50.0)
+    before = journal.size
+    journal.compact([], *ledger.snapshot())
+    assert journal.size < before
+    journal.close()
+
+    restored = Ledger()
+    OrderJournal(path).replay(restored)
+    assert restored.get_position("HSX:MWG") == ledger.get_position("HSX:MWG")
+
+
+def test_needs_compaction_waits_for_twice_the_live_size(path):
+    journal = OrderJournal(path, initial_size=4096, compact_at=1024)
+    records = [make_record(f"ID{i}") for i in range(40)]
+    for record in records:
+        journal.order(record)
+    assert journal.needs_compaction()
+
+    journal.compact(records, {}, None)
+    live = journal.size
+    assert live > 1024
+    assert not journal.needs_compaction()
+    while journal.size < 2 * live:
+        journal.update(records[0])
+    assert journal.needs_compaction()
+    journal.close()
@@ -0,0 +1,97 @@
+import pytest
+
+from paperbroker.session.ledger import Ledger
+
+SYMBOL = "HNXDS:VN30F2508"
+
+
+@pytest.fixture
+def ledger():
+    ledger = Ledger({SYMBOL: 100})
+    ledger.cash = 1_000_000.0
+    return ledger
+
+
+def test_open_and_add_average_the_entry_price(ledger):
+    ledger.on_trade(SYMBOL, True, 2, 1600)
+    ledger.on_trade(SYMBOL, True, 2, 1610)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == 4
+    assert position["avgPrice"] == pytest.approx(1605)
+    assert position["realizedPnl"] == 0
+    assert ledger.cash == pytest.approx(1_000_000 - (2 * 1600 + 2 * 1610) * 100)
+
+
+def test_reduce_books_realized_pnl_and_keeps_the_average(ledger):
+    ledger.on_trade(SYMBOL, True, 4, 1600)
+    ledger.on_trade(SYMBOL, False, 1, 1620)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == 3
+    assert position["avgPrice"] == 1600
+    assert position["realizedPnl"] == pytest.approx(20 * 100)
+
+
+def test_close_resets_the_average(ledger):
+    ledger.on_trade(SYMBOL, False, 2, 1610)
+    ledger.on_trade(SYMBOL, True, 2, 1600)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == 0
+    assert position["avgPrice"] == 0
+    assert position["realizedPnl"] == pytest.approx(2 * 10 * 100)
+    assert ledger.get_positions() == {}
+
+
+def test_flip_realizes_the_old_side_and_opens_at_the_fill_price(ledger):
+    ledger.on_trade(SYMBOL, True, 2, 1600)
+    ledger.on_trade(SYMBOL, False, 5, 1590)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == -3
+    assert position["avgPrice"] == 1590
+    assert position["realizedPnl"] == pytest.approx(2 * -10 * 100)
+
+
+def test_seeded_average_is_unknown_until_flat(ledger):
+    ledger.seed(
+        portfolio={
+            "holdings": [
+                {
+                    "instrument": SYMBOL,
+                    "quantity": 2,
+                    "openPrice": 40_250_000.0,
+                    "currentPrice": 1610,
+                    "totalCost": 80_500_000.0,
+                }
+            ]
+        },
+        remain_balance={"remainBalance": 500.0},
+    )
+    assert ledger.get_position(SYMBOL)["avgPrice"] is None
+    assert ledger.get_last_price(SYMBOL) == 1610
+    assert ledger.cash == 500.0
+
+    ledger.on_trade(SYMBOL, True, 1, 1612)
+    ledger.on_trade(SYMBOL, False, 2, 1615)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == 1
+    assert position["avgPrice"] is None
+    assert position["realizedPnl"] == 0
+
+    ledger.on_trade(SYMBOL, False, 2, 1620)
+    position = ledger.get_position(SYMBOL)
+    assert position["quantity"] == -1
+    assert position["avgPrice"] == 1620
+
+
+def test_seed_without_portfolio_keeps_positions(ledger):
+    ledger.on_trade(SYMBOL, True, 1, 1600)
+    ledger.seed(portfolio=None, remain_balance=None)
+    assert ledger.get_quantity(SYMBOL) == 1
+
+
+def test_snapshot_restore_round_trip(ledger):
+    ledger.on_trade(SYMBOL, True, 3, 1600)
+    ledger.on_trade(SYMBOL, False, 1, 1610)
+    restored = Ledger({SYMBOL: 100})
+    restored.restore(*ledger.snapshot())
+    assert restored.get_position(SYMBOL) == ledger.get_position(SYMBOL)
+    assert restored.cash == ledger.cash
@@ -0,0 +1,110 @@
+import pytest
+
+from paperbroker.session.ledger import Ledger
+from paperbroker.session.order_store import OrderRecord, OrderStatus, OrderStore, Side
+from paperbroker.session.risk import RiskGate, RiskLimits, RiskRejected
+
+SYMBOL = "HSX:MWG"
+
+
+def make_gate(**limits):
+    orders = OrderStore()
+    ledger = Ledger()
+    return RiskGate(RiskLimits(**limits), orders, ledger), orders, ledger
+
+
+def add_order(orders, cl_ord_id, side, qty, status=OrderStatus.NEW):
+    return orders.add(
+        OrderRecord(
+            cl_ord_id,
+            exchange="HSX",
+            symbol="MWG",
+            side=side,
+            qty=qty,
+            price=50.0,
+            status=status,
+        )
+    )
+
+
+def rejected_by(check, gate, *args, **kwargs):
+    with pytest.raises(RiskRejected) as info:
+        gate.check(SYMBOL, *args, **kwargs)
+    return info.value.check == check
+
+
+def test_max_position_counts_working_orders_on_the_same_side():
+    gate, orders, ledger = make_gate(max_position=10)
+    ledger.on_trade(SYMBOL, True, 4, 50.0)
+    add_order(orders, "A", Side.BUY, 5)
+    gate.check(SYMBOL, Side.BUY, 1, 50.0)  # 4 + 5 + 1 = 10
+    assert rejected_by("max_position", gate, Side.BUY, 2, 50.0)
+    # Sells reduce the position, whatever is working on the buy side
+    gate.check(SYMBOL, Side.SELL, 10, 50.0)
+
+
+def test_max_position_frees_filled_and_finished_orders():
+    gate, orders, ledger = make_gate(max_position=10)
+    record = add_order(orders, "A", Side.BUY, 8)
+    assert rejected_by("max_position", gate, Side.BUY, 3, 50.0)
+
+    orders.apply_fill(record, 5, 50.0)
+    ledger.on_trade(SYMBOL, True, 5, 50.0)
+    assert orders.open_qty(SYMBOL, Side.BUY) == 3
+    assert rejected_by("max_position", gate, Side.BUY, 3, 50.0)
+
+    orders.set_status(record, OrderStatus.CANCELED)
+    assert orders.open_qty(SYMBOL, Side.BUY) == 0
+    gate.check(SYMBOL, Side.BUY, 5, 50.0)
+
+
+def test_max_position_counts_earlier_orders_in_the_batch():
+    gate, _, _ = make_gate(max_position=10)
+    gate.check(SYMBOL, Side.BUY, 6, 50.0, pending_open=1, pending_qty=4)
+    assert rejected_by(
+        "max_position", gate, Side.BUY, 7, 50.0, pending_open=1, pending_qty=4
+    )
+
+
+def test_max_position_replace_swaps_the_old_qty_for_the_new():
+    gate, orders, _ = make_gate(max_position=10)
+    add_order(orders, "A", Side.BUY, 8)
+    gate.check(SYMBOL, Side.BUY, 10, 50.0, new_order=False, replaced_qty=8)
+    assert rejected_by(
+        "max_position", gate, Side.BUY, 11, 50.0, new_order=False, replaced_qty=8
+    )
+
+
+def test_max_position_allows_orders_that_shrink_an_oversized_position():
+    gate, _, ledger = make_gate(max_position=10)
+    ledger.on_trade(SYMBOL, False, 15, 50.0)
+    gate.check(SYMBOL, Side.BUY, 3, 50.0)
+    assert rejected_by("max_position", gate, Side.SELL, 1, 50.0)
+
+
+def test_max_open_orders_ignores_amendments():
+    gate, orders, _ = make_gate(max_open_orders=2)
+    add_order(orders, "A", Side.BUY, 1)
+    gate.check(SYMBOL, Side.BUY, 1, 50.0)
+    assert rejected_by("max_open_orders", gate, Side.BUY, 1, 50.0, pending_open=1)
+    gate.check(SYMBOL, Side.BUY, 1, 50.0, pending_open=1, new_order=False)
+
+
+def test_per_symbol_override_falls_back_to_global_limits():
+    limits = RiskLimits(
+        max_order_qty=100,
+        max_position=10,
+        per_symbol={SYMBOL: RiskLimits(max_order_qty=5)},
+    )
+    gate = RiskGate(limits, OrderStore(), Ledger())
+    assert rejected_by("max_order_qty", gate, Side.BUY, 6, 50.0)
+    gate.check(SYMBOL, Side.BUY, 5, 50.0)
+    gate.check("HSX:FPT", Side.BUY, 6, 50.0)
+    assert limits.for_symbol(SYMBOL).max_position == 10
+
+
+def test_price_collar_uses_the_reference_price():
+    gate, _, _ = make_gate(price_collar=0.05)
+    gate.set_reference_price(SYMBOL, 100.0)
+    gate.check(SYMBOL, Side.BUY, 1, 105.0)
+    assert rejected_by("price_collar", gate, Side.BUY, 1, 106.0)